@@ -15,39 +15,121 @@ This adapter is SIEM-agnostic and intended for:
 """
 from core.summarizer import summarize
 
-from typing import Any, Dict
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from core.pipeline import run_pipeline, PipelineError
-from core.ai.reasoner import reason_with_llm, AIReasonerError
+from core import jsonio
+from core.pipeline import run_pipeline, run_pipeline_batch, PipelineError
+from core.ai.reasoner import (
+    AIReasonerError,
+    close_async_client,
+    open_async_client,
+    reason_with_llm_async,
+    reason_with_llm_batch_async,
+)
 
 
 # -----------------------------
 # App
 # -----------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Long-lived LLM HTTP client: keep-alive connections shared across requests
+    open_async_client()
+    yield
+    await close_async_client()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded via core.jsonio (orjson when installed).
+    """
+    def render(self, content: Any) -> bytes:
+        return jsonio.dumps_bytes(content)
+
+
 app = FastAPI(
     title="SOC Triage Engine (Local)",
     version="v1",
     description="Deterministic SOC triage engine with scoring, MITRE inference, and policy gating",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 
 # -----------------------------
 # Request / Response models
 # -----------------------------
+# Routes return plain dicts encoded by the default response class; the response
+# models below only document the shape in /docs (no per-response validation).
+
+# Request bodies are decoded straight to dicts (no per-request model validation);
+# these schemas only document them in /docs.
+_PIPELINE_REQUEST_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["incident", "signals"],
+    "properties": {
+        "incident": {"type": "object"},
+        "signals": {"type": "object"},
+    },
+}
+
+_BATCH_REQUEST_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "required": ["items"],
+    "properties": {
+        "items": {"type": "array", "items": _PIPELINE_REQUEST_SCHEMA},
+    },
+}
 
-class PipelineRequest(BaseModel):
-    incident: Dict[str, Any]
-    signals: Dict[str, Any]
+
+def _request_body_doc(schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
 
 
 class PipelineResponse(BaseModel):
     result: Dict[str, Any]
 
 
+class BatchPipelineResponse(BaseModel):
+    results: List[Dict[str, Any]]
+
+
+# Upper bound on incidents per batch request (cost/safety)
+_MAX_BATCH_ITEMS = int(os.getenv("TRIAGE_MAX_BATCH_ITEMS", "50"))
+
+
+# -----------------------------
+# Request parsing
+# -----------------------------
+
+async def _read_json(request: Request) -> Any:
+    try:
+        return jsonio.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Request body must be valid JSON")
+
+
+def _pipeline_args(body: Any, where: str = "body") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    if (
+        not isinstance(body, dict)
+        or not isinstance(body.get("incident"), dict)
+        or not isinstance(body.get("signals"), dict)
+    ):
+        raise HTTPException(
+            status_code=422,
+            detail=f"{where} must be an object with 'incident' and 'signals' objects"
+        )
+    return body["incident"], body["signals"]
+
+
 # -----------------------------
 # Routes
 # -----------------------------
@@ -58,39 +140,21 @@ def health():
 
 
 # --------------------------------
-# Deterministic triage (DEBUG SAFE)
+# Deterministic + AI advisory
 # --------------------------------
-@app.post("/triage-ai", response_model=PipelineResponse)
-def triage_ai(req: PipelineRequest):
-    """
-    Deterministic triage + AI advisory (policy-guarded).
-    """
-
-    # Run deterministic pipeline
+def _run_pipeline_with_summary(incident: Dict[str, Any], signals: Dict[str, Any]) -> Dict[str, Any]:
     output = run_pipeline(
-        incident=req.incident,
-        signals=req.signals,
+        incident=incident,
+        signals=signals,
     )
 
     # Always include deterministic summary
     output["summary"] = summarize(output)
-
-    # AI advisory (never modifies core results)
-    ai = reason_with_llm(output)
-    output["ai"] = ai
-
-    # Mark mode
-    output["meta"]["mode"] = "deterministic+ai"
-
-    return {"result": output}
+    return output
 
 
-
-# --------------------------------
-# Deterministic + AI advisory
-# --------------------------------
-@app.post("/triage-ai", response_model=PipelineResponse)
-def triage_ai(req: PipelineRequest):
+@app.post("/triage-ai", responses={200: {"model": PipelineResponse}}, openapi_extra=_request_body_doc(_PIPELINE_REQUEST_SCHEMA))
+async def triage_ai(request: Request):
     """
     Deterministic triage + optional AI advisory layer.
 
@@ -100,13 +164,14 @@ def triage_ai(req: PipelineRequest):
     - safe to disable via env vars
     """
 
+    incident, signals = _pipeline_args(await _read_json(request))
+
     try:
-        deterministic = run_pipeline(
-            incident=req.incident,
-            signals=req.signals,
-        )
+        # Deterministic stage is CPU-bound; run it off the event loop
+        deterministic = await run_in_threadpool(_run_pipeline_with_summary, incident, signals)
 
-        ai = reason_with_llm(deterministic)
+        # AI advisory (never modifies core results)
+        ai = await reason_with_llm_async(deterministic)
 
         # Attach AI output
         deterministic["ai"] = ai
@@ -129,3 +194,63 @@ def triage_ai(req: PipelineRequest):
             status_code=500,
             detail="Internal server error"
         )
+
+
+# --------------------------------
+# Batch: deterministic + AI advisory
+# --------------------------------
+def _run_batch_pipelines(items: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    outputs = run_pipeline_batch(items)
+    for output in outputs:
+        output["summary"] = summarize(output)
+    return outputs
+
+
+@app.post("/triage-ai/batch", responses={200: {"model": BatchPipelineResponse}}, openapi_extra=_request_body_doc(_BATCH_REQUEST_SCHEMA))
+async def triage_ai_batch(request: Request):
+    """
+    Deterministic triage + AI advisory for several incidents (e.g. a SIEM alert flush).
+
+    Results are returned in request order. AI advisory for the whole batch is
+    requested in a single LLM call where possible.
+    """
+
+    body = await _read_json(request)
+    if not isinstance(body, dict) or not isinstance(body.get("items"), list):
+        raise HTTPException(status_code=422, detail="body must be an object with an 'items' array")
+
+    raw_items = body["items"]
+    if len(raw_items) > _MAX_BATCH_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large ({len(raw_items)} items > {_MAX_BATCH_ITEMS})"
+        )
+
+    items = [_pipeline_args(item, where=f"items[{i}]") for i, item in enumerate(raw_items)]
+
+    try:
+        # Deterministic stage is CPU-bound; one worker thread keeps the event loop free
+        outputs = await run_in_threadpool(_run_batch_pipelines, items)
+
+        ais = await reason_with_llm_batch_async(outputs) if outputs else []
+
+        for output, ai in zip(outputs, ais):
+            output["ai"] = ai
+            output["meta"]["mode"] = "deterministic+ai"
+
+        return {"results": outputs}
+
+    except PipelineError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except AIReasonerError as e:
+        raise HTTPException(
+            status_code=502,
+            detail=f"AI reasoner error: {str(e)}"
+        )
+
+    except Exception:
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error"
+        )
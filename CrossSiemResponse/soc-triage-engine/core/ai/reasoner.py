@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import threading
 import time
-from collections import deque
-import json
 import os
-from typing import Any, Dict
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
-from core.ai.validator import load_schema, validate_against_schema, AIOutputValidationError
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from core import jsonio
+from core.context import prompt_context_json
+from core.ai.validator import CompiledValidator, get_validator, validate_against_schema, AIOutputValidationError
 
 
 class AIReasonerError(Exception):
@@ -21,9 +32,36 @@ class AIReasonerError(Exception):
 _MAX_CALLS_PER_MIN = int(os.getenv("LLM_MAX_CALLS_PER_MIN", "10"))
 _MAX_PROMPT_CHARS = int(os.getenv("LLM_MAX_PROMPT_CHARS", "12000"))
 _AUDIT_ENABLED = os.getenv("LLM_AUDIT", "1").strip() == "1"
+_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", "300"))
+_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+_BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
 
 # in-memory per-process call window (good enough for local/dev; for multi-worker use Redis later)
-_call_times = deque()  # timestamps (float epoch seconds)
+# Ring of the last _MAX_CALLS_PER_MIN call times (time.monotonic); the slot at
+# _call_idx holds the oldest one. Guarded by _rate_lock (threadpool callers).
+_call_times: List[Optional[float]] = [None] * max(_MAX_CALLS_PER_MIN, 0)
+_call_idx = 0
+_rate_lock = threading.Lock()
+
+# recent validated responses: blake2b(base_url + model + temperature + prompt) -> (expires_at, JSON bytes).
+# Duplicate alerts / SOAR retries produce identical prompts and reuse the answer.
+_response_cache: "OrderedDict[bytes, Tuple[float, bytes]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+# circuit breaker: after _BREAKER_FAILURES consecutive provider failures (transport
+# errors, timeouts, 5xx) skip live calls for _BREAKER_COOLDOWN_S and use the fallback
+_breaker_failures = 0
+_breaker_open_until = 0.0
+_breaker_lock = threading.Lock()
+
+# keep-alive HTTP session: reuses TCP/TLS connections across LLM calls
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# shared async HTTP client for reason_with_llm_async, opened by the app lifespan
+# (see open_async_client); it is bound to that event loop
+_async_client: Optional["httpx.AsyncClient"] = None
 
 
 def _audit_log(event: str, details: Dict[str, Any]) -> None:
@@ -37,28 +75,125 @@ def _audit_log(event: str, details: Dict[str, Any]) -> None:
         "event": event,
         "details": details,
     }
-    print(f"[AI_AUDIT] {json.dumps(record, ensure_ascii=False)}")
+    print(f"[AI_AUDIT] {jsonio.dumps(record)}")
 
 
-def _enforce_rate_limit() -> None:
+def _enforce_rate_limit(n: int = 1) -> None:
     """
     Hard rate limit to prevent runaway cost.
+    Takes n slots at once: either all of them are free or none is taken.
     """
-    now = time.time()
-    window_start = now - 60
+    global _call_idx
 
-    while _call_times and _call_times[0] < window_start:
-        _call_times.popleft()
+    if n <= 0:
+        return
+
+    with _rate_lock:
+        now = time.monotonic()
+        size = len(_call_times)
 
-    if len(_call_times) >= _MAX_CALLS_PER_MIN:
-        raise AIReasonerError(f"AI rate limit exceeded ({_MAX_CALLS_PER_MIN}/minute).")
+        # The n oldest of the last N calls must all have left the 60s window
+        # (ring order is chronological, so checking the newest of them is enough)
+        newest_needed = _call_times[(_call_idx + n - 1) % size] if n <= size else now
+        if n > size or (newest_needed is not None and newest_needed >= now - 60):
+            raise AIReasonerError(
+                f"AI rate limit exceeded ({_MAX_CALLS_PER_MIN}/minute)."
+                + (f" {n} calls needed." if n > 1 else "")
+            )
 
-    _call_times.append(now)
+        for _ in range(n):
+            _call_times[_call_idx] = now
+            _call_idx = (_call_idx + 1) % size
 
 
-def _offline_fallback(deterministic: Dict[str, Any]) -> Dict[str, Any]:
+# -----------------------------
+# Response cache / circuit breaker
+# -----------------------------
+def _response_key(config: Dict[str, Any], prompt: str) -> bytes:
+    # Everything that can change the answer: endpoint, model, sampling, prompt
+    head = f"{config['base_url']}\n{config['model']}\n{config['temperature']!r}\n"
+    return hashlib.blake2b((head + prompt).encode("utf-8"), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> Optional[bytes]:
+    if _CACHE_TTL_S <= 0:
+        return None
+    with _cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: bytes, out: Any) -> None:
+    if _CACHE_TTL_S <= 0 or _CACHE_MAX_ENTRIES <= 0:
+        return
+    raw = jsonio.dumps_bytes(out)
+    with _cache_lock:
+        _response_cache[key] = (time.monotonic() + _CACHE_TTL_S, raw)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > _CACHE_MAX_ENTRIES:
+            _response_cache.popitem(last=False)
+
+
+def _breaker_is_open() -> bool:
+    return _breaker_open_until > time.monotonic()
+
+
+def _breaker_record(provider_failure: bool) -> None:
+    """
+    Success (False) closes the breaker; a provider failure counts towards opening it.
+    After the cooldown one failure is enough to re-open (half-open probe).
     """
-    Schema-valid fallback output when LLM_OFFLINE=1 or no key configured.
+    global _breaker_failures, _breaker_open_until
+    with _breaker_lock:
+        if not provider_failure:
+            _breaker_failures = 0
+            _breaker_open_until = 0.0
+            return
+        _breaker_failures += 1
+        if _BREAKER_FAILURES > 0 and _breaker_failures >= _BREAKER_FAILURES:
+            _breaker_open_until = time.monotonic() + _BREAKER_COOLDOWN_S
+            _audit_log("ai_circuit_open", {"failures": _breaker_failures, "cooldown_s": _BREAKER_COOLDOWN_S})
+
+
+def _is_provider_failure(e: Exception) -> bool:
+    """
+    Transport errors, timeouts and 5xx count against the provider; 4xx and bad output do not.
+    """
+    response = getattr(e, "response", None)
+    if isinstance(e, requests.HTTPError) or (httpx is not None and isinstance(e, httpx.HTTPStatusError)):
+        return response is not None and response.status_code >= 500
+    return isinstance(e, requests.RequestException) or (httpx is not None and isinstance(e, httpx.HTTPError))
+
+
+# Static parts of the offline fallback. _offline_fallback hands out fresh
+# containers on every call, because callers own (and may mutate) the result.
+_STATIC_ASSESSMENT = (
+    "Offline mode: advisory summary generated without an LLM. "
+    "Enable live mode to generate richer narrative and recommended queries."
+)
+_STATIC_RECOMMENDATIONS = (
+    {"type": "verification", "description": "Confirm the entities (IP/user/domain) exist in logs and match the incident timeline."},
+    {"type": "monitoring", "description": "Monitor for repeated authentication failures, impossible travel, and new device sign-ins."},
+    {"type": "containment", "description": "If confidence remains high after verification: reset credentials and enforce MFA for impacted accounts."},
+)
+# Why live reasoning was skipped, by fallback reason (as audited by _llm_config)
+_FALLBACK_ASSUMPTIONS = {
+    "LLM_OFFLINE=1": "Live LLM reasoning is disabled (LLM_OFFLINE=1).",
+    "missing_api_key_or_model": "Live LLM reasoning is not configured (missing LLM_API_KEY or LLM_MODEL).",
+    "circuit_open": "Live LLM reasoning is temporarily unavailable (repeated provider failures; circuit breaker open).",
+}
+_STATIC_MISSING_DATA = ("Raw authentication event details (source IP, user agent, device ID, geo), and correlated alerts across hosts/users.",)
+
+
+def _offline_fallback(deterministic: Dict[str, Any], reason: str = "LLM_OFFLINE=1") -> Dict[str, Any]:
+    """
+    Schema-valid fallback output when LLM_OFFLINE=1, no key configured or the circuit is open.
     Keeps your pipeline testable and demoable without paid calls.
     """
     scoring = deterministic.get("scoring", {})
@@ -80,10 +215,7 @@ def _offline_fallback(deterministic: Dict[str, Any]) -> Dict[str, Any]:
 
     out = {
         "observations": obs,
-        "assessment": (
-            "Offline mode: advisory summary generated without an LLM. "
-            "Enable live mode to generate richer narrative and recommended queries."
-        ),
+        "assessment": _STATIC_ASSESSMENT,
         "mitre_mapping": [
             {
                 "tactic": m.get("tactic", ""),
@@ -93,68 +225,52 @@ def _offline_fallback(deterministic: Dict[str, Any]) -> Dict[str, Any]:
             }
             for m in mitre[:5]
         ],
-        "recommendations": [
-            {"type": "verification", "description": "Confirm the entities (IP/user/domain) exist in logs and match the incident timeline."},
-            {"type": "monitoring", "description": "Monitor for repeated authentication failures, impossible travel, and new device sign-ins."},
-            {"type": "containment", "description": "If confidence remains high after verification: reset credentials and enforce MFA for impacted accounts."}
-        ],
+        "recommendations": [r.copy() for r in _STATIC_RECOMMENDATIONS],
         "confidence": int(scoring.get("score", 0) or 0),
-        "assumptions": ["Live LLM reasoning is disabled (LLM_OFFLINE=1 or missing API key)."],
-        "missing_data": ["Raw authentication event details (source IP, user agent, device ID, geo), and correlated alerts across hosts/users."]
+        "assumptions": [_FALLBACK_ASSUMPTIONS[reason]],
+        "missing_data": list(_STATIC_MISSING_DATA)
     }
     return out
 
 
+def _prompt_too_large(prompt: str) -> bool:
+    return len(prompt) > _MAX_PROMPT_CHARS
+
+
+_PROMPT_PREFIX = (
+    "You are a SOC triage assistant. Produce an ADVISORY triage response.\n"
+    "Rules:\n"
+    "1) Output MUST be valid JSON only. No markdown. No extra keys.\n"
+    "2) Do not claim actions were executed.\n"
+    "3) If evidence is missing, state assumptions and missing_data.\n"
+    "4) Keep recommendations actionable and safe.\n"
+    "5) Confidence is 0-100 (integer).\n\n"
+    "Return JSON matching this exact shape:\n"
+    "{\n"
+    '  "observations": ["..."],\n'
+    '  "assessment": "...",\n'
+    '  "mitre_mapping": [{"tactic":"...","technique":"Txxxx - ...","confidence":0.0,"evidence":["..."]}],\n'
+    '  "recommendations": [{"type":"query|verification|containment|monitoring","description":"..."}],\n'
+    '  "confidence": 0,\n'
+    '  "assumptions": ["..."],\n'
+    '  "missing_data": ["..."]\n'
+    "}\n\n"
+    "Here is the deterministic context (JSON):\n"
+)
+
+
 def _build_prompt(deterministic: Dict[str, Any]) -> str:
     """
     Instruct the model to return STRICT JSON matching our ai_response.schema.json.
     """
-    incident = deterministic.get("incident", {})
-    scoring = deterministic.get("scoring", {})
-    mitre = deterministic.get("mitre", [])
+    return _single_prompt(prompt_context_json(deterministic))
 
-    context = {
-        "incident": {
-            "title": incident.get("title"),
-            "severity": incident.get("severity"),
-            "timestamp": incident.get("timestamp"),
-            "source": incident.get("source"),
-            "entities": incident.get("entities", []),
-            "tags": incident.get("tags", []),
-        },
-        "scoring": {
-            "score": scoring.get("score"),
-            "level": scoring.get("level"),
-            "reasons": scoring.get("reasons", []),
-            "signals_used": scoring.get("signals_used", {}),
-        },
-        "mitre_candidates": mitre,
-    }
 
-    prompt = (
-        "You are a SOC triage assistant. Produce an ADVISORY triage response.\n"
-        "Rules:\n"
-        "1) Output MUST be valid JSON only. No markdown. No extra keys.\n"
-        "2) Do not claim actions were executed.\n"
-        "3) If evidence is missing, state assumptions and missing_data.\n"
-        "4) Keep recommendations actionable and safe.\n"
-        "5) Confidence is 0-100 (integer).\n\n"
-        "Return JSON matching this exact shape:\n"
-        "{\n"
-        '  "observations": ["..."],\n'
-        '  "assessment": "...",\n'
-        '  "mitre_mapping": [{"tactic":"...","technique":"Txxxx - ...","confidence":0.0,"evidence":["..."]}],\n'
-        '  "recommendations": [{"type":"query|verification|containment|monitoring","description":"..."}],\n'
-        '  "confidence": 0,\n'
-        '  "assumptions": ["..."],\n'
-        '  "missing_data": ["..."]\n'
-        "}\n\n"
-        "Here is the deterministic context (JSON):\n"
-        + json.dumps(context, ensure_ascii=False)
-    )
+def _single_prompt(context_json: str) -> str:
+    prompt = _PROMPT_PREFIX + context_json
 
     # Prompt size guard (cost/safety)
-    if len(prompt) > _MAX_PROMPT_CHARS:
+    if _prompt_too_large(prompt):
         raise AIReasonerError(
             f"Prompt exceeds limit ({len(prompt)} chars > {_MAX_PROMPT_CHARS}). Refusing AI call."
         )
@@ -162,32 +278,68 @@ def _build_prompt(deterministic: Dict[str, Any]) -> str:
     return prompt
 
 
-def reason_with_llm(
-    deterministic: Dict[str, Any],
-    schema_path: str = "schemas/ai_response.schema.json",
-    timeout_s: int = 45
-) -> Dict[str, Any]:
+_BATCH_PROMPT_PREFIX = (
+    "You are a SOC triage assistant. Produce one ADVISORY triage response per incident.\n"
+    "Rules:\n"
+    "1) Output MUST be valid JSON only. No markdown. No extra keys.\n"
+    "2) Do not claim actions were executed.\n"
+    "3) If evidence is missing, state assumptions and missing_data.\n"
+    "4) Keep recommendations actionable and safe.\n"
+    "5) Confidence is 0-100 (integer).\n"
+    "6) Return exactly one result per incident, in the same order as the input.\n\n"
+    "Return JSON matching this exact shape:\n"
+    '{"results": [<one object per incident>]}\n'
+    "where each object is:\n"
+    "{\n"
+    '  "observations": ["..."],\n'
+    '  "assessment": "...",\n'
+    '  "mitre_mapping": [{"tactic":"...","technique":"Txxxx - ...","confidence":0.0,"evidence":["..."]}],\n'
+    '  "recommendations": [{"type":"query|verification|containment|monitoring","description":"..."}],\n'
+    '  "confidence": 0,\n'
+    '  "assumptions": ["..."],\n'
+    '  "missing_data": ["..."]\n'
+    "}\n\n"
+    "Here are the deterministic contexts (JSON array, one per incident):\n"
+)
+
+
+def _build_batch_prompt(contexts: List[str]) -> str:
     """
-    Produces schema-validated AI advisory output.
-
-    Env vars:
-      LLM_OFFLINE=1                     -> use offline fallback (no network)
-      LLM_BASE_URL=https://api.openai.com/v1
-      LLM_API_KEY=...
-      LLM_MODEL=gpt-4o-mini (example)
-      LLM_TEMPERATURE=0.2
-      LLM_MAX_CALLS_PER_MIN=10          -> hard rate limit (per process)
-      LLM_MAX_PROMPT_CHARS=12000        -> hard prompt size guard
-      LLM_AUDIT=1                       -> audit logs to stdout
+    One prompt for several serialized incident contexts; sized by _batch_chunks.
     """
-    schema = load_schema(schema_path)
+    return _BATCH_PROMPT_PREFIX + "[" + ",".join(contexts) + "]"
+
 
+def _batch_chunks(contexts: List[str]) -> List[List[int]]:
+    """
+    Greedy split of incident indexes (in order) into batches whose combined
+    prompt stays within LLM_MAX_PROMPT_CHARS. An incident too large to share a
+    prompt ends up alone and is sent as a single-incident prompt.
+    """
+    empty = len(_BATCH_PROMPT_PREFIX) + 2  # "[" + "]"
+    chunks: List[List[int]] = []
+    chunk: List[int] = []
+    size = empty
+    for i, ctx in enumerate(contexts):
+        if chunk and size + 1 + len(ctx) > _MAX_PROMPT_CHARS:
+            chunks.append(chunk)
+            chunk, size = [], empty
+        size += len(ctx) + (1 if chunk else 0)
+        chunk.append(i)
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _llm_config() -> Tuple[Optional[Dict[str, Any]], str]:
+    """
+    Applies kill switch and config guards.
+    Returns (None, fallback reason) when the offline fallback should be used instead.
+    """
     # Kill switch
     if os.getenv("LLM_OFFLINE", "").strip() == "1":
         _audit_log("ai_fallback_used", {"reason": "LLM_OFFLINE=1"})
-        out = _offline_fallback(deterministic)
-        validate_against_schema(out, schema)
-        return out
+        return None, "LLM_OFFLINE=1"
 
     base_url = os.getenv("LLM_BASE_URL", "https://api.openai.com/v1").rstrip("/")
     api_key = os.getenv("LLM_API_KEY", "").strip()
@@ -201,42 +353,320 @@ def reason_with_llm(
     # Missing config -> safe fallback
     if not api_key or not model:
         _audit_log("ai_fallback_used", {"reason": "missing_api_key_or_model"})
-        out = _offline_fallback(deterministic)
-        validate_against_schema(out, schema)
-        return out
+        return None, "missing_api_key_or_model"
 
-    # Hard rate limit before any network call
-    _enforce_rate_limit()
+    # Provider degraded (circuit open) -> fail fast to fallback
+    if _breaker_is_open():
+        _audit_log("ai_fallback_used", {"reason": "circuit_open"})
+        return None, "circuit_open"
+
+    return {"base_url": base_url, "api_key": api_key, "model": model, "temperature": temperature}, ""
 
-    prompt = _build_prompt(deterministic)
 
-    url = f"{base_url}/chat/completions"
-    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-    payload = {
+def _make_call(config: Dict[str, Any], prompt: str) -> Dict[str, Any]:
+    """
+    Builds the chat-completions request for an already-guarded prompt.
+    """
+    model = config["model"]
+
+    _audit_log("ai_call_attempt", {"model": model, "base_url": config["base_url"]})
+
+    return {
         "model": model,
-        "temperature": temperature,
-        "messages": [
-            {"role": "system", "content": "You are a careful SOC analyst. Follow the schema exactly."},
-            {"role": "user", "content": prompt}
-        ],
-        "response_format": {"type": "json_object"}
+        "url": f"{config['base_url']}/chat/completions",
+        "headers": {"Authorization": f"Bearer {config['api_key']}", "Content-Type": "application/json"},
+        "payload": {
+            "model": model,
+            "temperature": config["temperature"],
+            "messages": [
+                {"role": "system", "content": "You are a careful SOC analyst. Follow the schema exactly."},
+                {"role": "user", "content": prompt}
+            ],
+            "response_format": {"type": "json_object"}
+        },
     }
 
-    _audit_log("ai_call_attempt", {"model": model, "base_url": base_url})
 
+def _cached_result(key: bytes, validator: CompiledValidator) -> Optional[Dict[str, Any]]:
+    raw = _cache_get(key)
+    if raw is None:
+        return None
+    out = jsonio.loads(raw)
     try:
-        r = requests.post(url, headers=headers, json=payload, timeout=timeout_s)
-        r.raise_for_status()
-        data = r.json()
+        # Re-check: the schema file may have changed since the answer was cached
+        validate_against_schema(out, validator)
+    except AIOutputValidationError:
+        return None
+    return out
+
+
+def _prepare_call(deterministic: Dict[str, Any], validator: CompiledValidator) -> Dict[str, Any]:
+    """
+    Applies kill switch, config and cost guards, then builds the chat-completions request.
+    Returns a call carrying "result" instead when the offline fallback applies or an
+    identical request was answered recently.
+    """
+    config, fallback_reason = _llm_config()
+    if config is None:
+        return {"result": _validated_fallback(deterministic, validator, fallback_reason)}
+
+    prompt = _build_prompt(deterministic)
+    key = _response_key(config, prompt)
+
+    # Identical recent request: no rate-limit slot, no network
+    cached = _cached_hit(config, key, validator)
+    if cached is not None:
+        return cached
+
+    # Hard rate limit before any network call
+    _enforce_rate_limit()
+
+    call = _make_call(config, prompt)
+    call["cache_key"] = key
+    return call
+
+
+def _cached_hit(config: Dict[str, Any], key: bytes, validator: CompiledValidator) -> Optional[Dict[str, Any]]:
+    cached = _cached_result(key, validator)
+    if cached is None:
+        return None
+    _audit_log("ai_cache_hit", {"model": config["model"]})
+    return {"model": config["model"], "result": cached}
+
+
+def _call_succeeded(call: Dict[str, Any], out: Any) -> Any:
+    _breaker_record(False)
+    key = call.get("cache_key")
+    if key is not None:
+        _cache_put(key, out)
+    return out
 
-        content = data["choices"][0]["message"]["content"]
-        out = json.loads(content)
 
-        validate_against_schema(out, schema)
+def _call_failed(e: Exception) -> AIReasonerError:
+    # Any answer from the provider (even a 4xx or bad JSON) means it is reachable
+    _breaker_record(_is_provider_failure(e))
+    _audit_log("ai_call_failed", {"error": str(e)})
+    return AIReasonerError(str(e))
 
-        _audit_log("ai_call_success", {"model": model})
-        return out
+
+def _validated_fallback(deterministic: Dict[str, Any], validator: CompiledValidator, reason: str) -> Dict[str, Any]:
+    out = _offline_fallback(deterministic, reason)
+    validate_against_schema(out, validator)
+    return out
+
+
+def _completion_json(data: Dict[str, Any]) -> Any:
+    content = data["choices"][0]["message"]["content"]
+    return jsonio.loads(content)
+
+
+def _parse_completion(data: Dict[str, Any], validator: CompiledValidator, model: str) -> Dict[str, Any]:
+    out = _completion_json(data)
+
+    validate_against_schema(out, validator)
+
+    _audit_log("ai_call_success", {"model": model})
+    return out
+
+
+def _parse_batch_completion(
+    data: Dict[str, Any],
+    batch_validator: CompiledValidator,
+    validator: CompiledValidator,
+    expected: int,
+    model: str
+) -> List[Dict[str, Any]]:
+    out = _completion_json(data)
+
+    # Wrapper shape, then every item against the single-response schema
+    validate_against_schema(out, batch_validator)
+
+    results = out["results"]
+    if len(results) != expected:
+        raise ValueError(f"AI batch returned {len(results)} results for {expected} incidents")
+
+    for i, item in enumerate(results):
+        try:
+            validate_against_schema(item, validator)
+        except AIOutputValidationError as e:
+            raise AIOutputValidationError(f"results[{i}]: {e}") from e
+
+    _audit_log("ai_call_success", {"model": model, "batch_size": expected})
+    return results
+
+
+def _complete_sync(call: Dict[str, Any], timeout_s: int, parse: Callable[[Dict[str, Any]], Any]) -> Any:
+    try:
+        r = _SESSION.post(call["url"], headers=call["headers"], json=call["payload"], timeout=timeout_s)
+        r.raise_for_status()
+        out = parse(jsonio.loads(r.content))
 
     except (requests.RequestException, KeyError, ValueError, AIOutputValidationError) as e:
-        _audit_log("ai_call_failed", {"error": str(e)})
-        raise AIReasonerError(str(e)) from e
+        raise _call_failed(e) from e
+
+    return _call_succeeded(call, out)
+
+
+async def _complete_async(call: Dict[str, Any], timeout_s: int, parse: Callable[[Dict[str, Any]], Any]) -> Any:
+    if httpx is None:
+        return await asyncio.to_thread(_complete_sync, call, timeout_s, parse)
+
+    try:
+        if _async_client is not None:
+            r = await _async_client.post(call["url"], headers=call["headers"], json=call["payload"], timeout=timeout_s)
+        else:
+            # No app-level client (scripts, asyncio.run): a client bound to this call's event loop
+            async with httpx.AsyncClient() as client:
+                r = await client.post(call["url"], headers=call["headers"], json=call["payload"], timeout=timeout_s)
+        r.raise_for_status()
+        out = parse(jsonio.loads(r.content))
+
+    except (httpx.HTTPError, KeyError, ValueError, AIOutputValidationError) as e:
+        raise _call_failed(e) from e
+
+    return _call_succeeded(call, out)
+
+
+def open_async_client() -> None:
+    """
+    Create the shared AsyncClient. Call at app startup (lifespan) so requests
+    reuse pooled connections; no-op without httpx. Without it each async call
+    uses its own short-lived client.
+    """
+    global _async_client
+    if httpx is not None and _async_client is None:
+        _async_client = httpx.AsyncClient()
+
+
+async def close_async_client() -> None:
+    """
+    Close pooled connections of the shared AsyncClient (app shutdown).
+    """
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def reason_with_llm(
+    deterministic: Dict[str, Any],
+    schema_path: str = "schemas/ai_response.schema.json",
+    timeout_s: int = 45
+) -> Dict[str, Any]:
+    """
+    Produces schema-validated AI advisory output.
+
+    Env vars:
+      LLM_OFFLINE=1                     -> use offline fallback (no network)
+      LLM_BASE_URL=https://api.openai.com/v1
+      LLM_API_KEY=...
+      LLM_MODEL=gpt-4o-mini (example)
+      LLM_TEMPERATURE=0.2
+      LLM_MAX_CALLS_PER_MIN=10          -> hard rate limit (per process)
+      LLM_MAX_PROMPT_CHARS=12000        -> hard prompt size guard
+      LLM_AUDIT=1                       -> audit logs to stdout
+      LLM_CACHE_TTL_S=300               -> reuse answers to identical prompts (0 disables)
+      LLM_CACHE_MAX_ENTRIES=512
+      LLM_BREAKER_FAILURES=5            -> consecutive provider failures before failing fast
+      LLM_BREAKER_COOLDOWN_S=30         -> offline fallback while the circuit is open
+    """
+    validator = get_validator(schema_path)
+
+    call = _prepare_call(deterministic, validator)
+    if "result" in call:
+        return call["result"]
+
+    return _complete_sync(call, timeout_s, partial(_parse_completion, validator=validator, model=call["model"]))
+
+
+async def reason_with_llm_async(
+    deterministic: Dict[str, Any],
+    schema_path: str = "schemas/ai_response.schema.json",
+    timeout_s: int = 45
+) -> Dict[str, Any]:
+    """
+    Async variant of reason_with_llm for the HTTP adapter (same env vars and guards).
+    The LLM call runs on the event loop via httpx; without httpx it runs in a worker thread.
+    """
+    validator = get_validator(schema_path)
+
+    call = _prepare_call(deterministic, validator)
+    if "result" in call:
+        return call["result"]
+
+    return await _complete_async(call, timeout_s, partial(_parse_completion, validator=validator, model=call["model"]))
+
+
+async def reason_with_llm_batch_async(
+    deterministics: List[Dict[str, Any]],
+    schema_path: str = "schemas/ai_response.schema.json",
+    batch_schema_path: str = "schemas/ai_response_batch.schema.json",
+    timeout_s: int = 45
+) -> List[Dict[str, Any]]:
+    """
+    AI advisory for several incidents, returned in input order.
+
+    Incidents share LLM calls that return {"results": [...]}, as many per call
+    as fit LLM_MAX_PROMPT_CHARS; LLM_BATCH_MODE=per_item sends one call per
+    incident instead (for providers that limit response size). Rate-limit slots
+    for all calls are taken up front, so a batch is either fully sent or
+    rejected before any paid call.
+    """
+    validator = get_validator(schema_path)
+    batch_validator = get_validator(batch_schema_path)
+
+    config, fallback_reason = _llm_config()
+    if config is None:
+        return [_validated_fallback(d, validator, fallback_reason) for d in deterministics]
+
+    contexts = [prompt_context_json(d) for d in deterministics]
+    if os.getenv("LLM_BATCH_MODE", "single").strip() == "per_item":
+        chunks = [[i] for i in range(len(contexts))]
+    else:
+        chunks = _batch_chunks(contexts)
+        if len(chunks) > 1:
+            _audit_log("ai_batch_split", {"reason": "prompt_too_large", "items": len(contexts), "calls": len(chunks)})
+
+    # Build and size-check every prompt before spending anything
+    results: List[Optional[Dict[str, Any]]] = [None] * len(contexts)
+    pending: List[Tuple[List[int], str, Optional[bytes]]] = []
+    for chunk in chunks:
+        if len(chunk) > 1:
+            pending.append((chunk, _build_batch_prompt([contexts[i] for i in chunk]), None))
+            continue
+        prompt = _single_prompt(contexts[chunk[0]])
+        key = _response_key(config, prompt)
+        cached = _cached_hit(config, key, validator)
+        if cached is not None:
+            results[chunk[0]] = cached["result"]
+        else:
+            pending.append((chunk, prompt, key))
+
+    # Hard rate limit before any network call: one slot per call, all or nothing
+    _enforce_rate_limit(len(pending))
+
+    sends: List[Any] = []
+    for chunk, prompt, key in pending:
+        call = _make_call(config, prompt)
+        if key is not None:
+            call["cache_key"] = key
+            parse = partial(_parse_completion, validator=validator, model=call["model"])
+        else:
+            parse = partial(
+                _parse_batch_completion,
+                batch_validator=batch_validator,
+                validator=validator,
+                expected=len(chunk),
+                model=call["model"],
+            )
+        sends.append(_complete_async(call, timeout_s, parse))
+
+    outs = await asyncio.gather(*sends)
+
+    for (chunk, _, key), out in zip(pending, outs):
+        if key is not None:
+            results[chunk[0]] = out
+        else:
+            for i, item in zip(chunk, out):
+                results[i] = item
+    return results
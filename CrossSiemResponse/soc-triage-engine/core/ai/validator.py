@@ -1,30 +1,132 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple, Union
 
-from jsonschema import Draft7Validator
+from core import jsonio
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    from jsonschema import Draft7Validator
+except ImportError:
+    Draft7Validator = None
 
 
 class AIOutputValidationError(Exception):
     pass
 
 
+# A compiled validator raises AIOutputValidationError for invalid payloads.
+CompiledValidator = Callable[[Dict[str, Any]], None]
+
+# Parsed schemas and compiled validators, keyed by (absolute path, mtime).
+# Schemas are static files, so this amortizes parsing + validator construction
+# across requests while still picking up edits made during local development.
+_SCHEMA_CACHE: Dict[Tuple[str, int], Dict[str, Any]] = {}
+_VALIDATOR_CACHE: Dict[Tuple[str, int], CompiledValidator] = {}
+
+
+def _cache_key(schema_path: str) -> Tuple[str, int]:
+    p = Path(schema_path).resolve()
+    try:
+        mtime = p.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Schema not found: {schema_path}") from None
+    return str(p), mtime
+
+
 def load_schema(schema_path: str) -> Dict[str, Any]:
-    p = Path(schema_path)
-    if not p.exists():
-        raise FileNotFoundError(f"Schema not found: {schema_path}")
-    return json.loads(p.read_text(encoding="utf-8"))
+    key = _cache_key(schema_path)
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        schema = jsonio.loads(Path(key[0]).read_bytes())
+        _SCHEMA_CACHE[key] = schema
+    return schema
 
 
-def validate_against_schema(payload: Dict[str, Any], schema: Dict[str, Any]) -> None:
+def _fail(msgs: List[str]) -> None:
+    raise AIOutputValidationError("AI output failed schema validation: " + " | ".join(msgs))
+
+
+def _compile_jsonschema(schema: Dict[str, Any]) -> CompiledValidator:
+    if Draft7Validator is None:
+        raise RuntimeError("Neither fastjsonschema nor jsonschema is installed")
+
+    Draft7Validator.check_schema(schema)
     validator = Draft7Validator(schema)
-    errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
-
-    if errors:
-        msgs: List[str] = []
-        for e in errors[:10]:
-            path = ".".join([str(x) for x in e.path]) if e.path else "(root)"
-            msgs.append(f"{path}: {e.message}")
-        raise AIOutputValidationError("AI output failed schema validation: " + " | ".join(msgs))
+
+    def _validate(payload: Dict[str, Any]) -> None:
+        errors = sorted(validator.iter_errors(payload), key=lambda e: e.path)
+
+        if errors:
+            msgs: List[str] = []
+            for e in errors[:10]:
+                path = ".".join([str(x) for x in e.path]) if e.path else "(root)"
+                msgs.append(f"{path}: {e.message}")
+            _fail(msgs)
+
+    return _validate
+
+
+def _compile_fast(schema: Dict[str, Any]) -> CompiledValidator:
+    fn = fastjsonschema.compile(schema)
+
+    def _validate(payload: Dict[str, Any]) -> None:
+        try:
+            fn(payload)
+        except fastjsonschema.JsonSchemaValueException as e:
+            # fastjsonschema stops at the first error and names it "data.<path>".
+            path = ".".join(e.path[1:]) or "(root)"
+            message = e.message
+            if e.name and message.startswith(e.name + " "):
+                message = message[len(e.name) + 1:]
+            _fail([f"{path}: {message}"])
+
+    return _validate
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledValidator:
+    """
+    Compile a schema into a validator function.
+    Prefers fastjsonschema (generated code); falls back to jsonschema.
+    """
+    if fastjsonschema is not None:
+        try:
+            return _compile_fast(schema)
+        except fastjsonschema.JsonSchemaDefinitionException:
+            pass
+    return _compile_jsonschema(schema)
+
+
+def get_validator(schema_path: str) -> CompiledValidator:
+    """
+    Returns a compiled validator for the schema file, built once per file version.
+    """
+    key = _cache_key(schema_path)
+    validator = _VALIDATOR_CACHE.get(key)
+    if validator is None:
+        validator = compile_schema(load_schema(schema_path))
+        _VALIDATOR_CACHE[key] = validator
+    return validator
+
+
+def validate_against_schema(
+    payload: Dict[str, Any],
+    schema: Union[Dict[str, Any], CompiledValidator]
+) -> None:
+    """
+    Accepts either a raw schema dict or a compiled validator from get_validator().
+    """
+    validator = schema if callable(schema) else compile_schema(schema)
+    validator(payload)
+
+
+def validate_payload(payload: Dict[str, Any], schema_path: str) -> None:
+    """
+    Validate payload against a schema file using the cached compiled validator.
+    """
+    get_validator(schema_path)(payload)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from core import jsonio
+
+def build_prompt_context(deterministic: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Subset of the deterministic pipeline output that is sent to the LLM.
+    """
+    incident = deterministic.get("incident", {})
+    scoring = deterministic.get("scoring", {})
+    mitre = deterministic.get("mitre", [])
+
+    return {
+        "incident": {
+            "title": incident.get("title"),
+            "severity": incident.get("severity"),
+            "timestamp": incident.get("timestamp"),
+            "source": incident.get("source"),
+            "entities": incident.get("entities", []),
+            "tags": incident.get("tags", []),
+        },
+        "scoring": {
+            "score": scoring.get("score"),
+            "level": scoring.get("level"),
+            "reasons": scoring.get("reasons", []),
+            "signals_used": scoring.get("signals_used", {}),
+        },
+        "mitre_candidates": mitre,
+    }
+
+
+def prompt_context_json(deterministic: Dict[str, Any]) -> str:
+    """
+    Serialized prompt context. Built by the AI layer once per call and passed
+    along from there (batch splits reuse it); never stored on the caller's output,
+    which may be edited and reasoned about again.
+    """
+    return jsonio.dumps(build_prompt_context(deterministic))
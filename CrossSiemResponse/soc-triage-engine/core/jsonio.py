@@ -0,0 +1,56 @@
+"""
+JSON encode/decode helpers.
+
+Uses orjson when installed and falls back to the stdlib json module.
+Output is compact UTF-8 either way.
+
+orjson only handles 64-bit integers (and rejects NaN/Infinity literals); input
+or output it cannot represent exactly goes through the stdlib instead.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# 19+ digit runs may be integers beyond 64 bits, which orjson.loads turns into floats
+_LONG_INT_BYTES = re.compile(rb"\d{19}")
+_LONG_INT_STR = re.compile(r"\d{19}")
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. "Integer exceeds 64-bit range"; unsupported types raise again below
+            pass
+    return _stdlib_dumps_bytes(obj)
+
+
+def dumps(obj: Any) -> str:
+    return dumps_bytes(obj).decode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Raises ValueError on malformed input (both backends).
+    """
+    if orjson is not None:
+        long_int = _LONG_INT_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_INT_STR
+        if long_int.search(data) is None:
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass  # stdlib decides (it also accepts NaN/Infinity and huge exponents)
+    return json.loads(data)
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Final, List, NamedTuple, Optional, Tuple
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-@dataclass
+
+@dataclass(slots=True)
 class MitreHypothesis:
     tactic: str
     technique: str  # "Txxxx - Name"
@@ -12,13 +19,119 @@ class MitreHypothesis:
     evidence: List[str] = field(default_factory=list)
 
 
-def _safe_get(d: Dict[str, Any], path: Tuple[str, ...], default: Any = None) -> Any:
-    cur: Any = d
-    for key in path:
-        if not isinstance(cur, dict) or key not in cur:
-            return default
-        cur = cur[key]
-    return cur
+class Technique(NamedTuple):
+    tactic: str
+    technique: str
+
+
+def _technique(tactic: str, technique: str) -> Technique:
+    return Technique(sys.intern(tactic), sys.intern(technique))
+
+
+# Interned (tactic, technique) pairs: every hypothesis for a technique shares
+# the same string objects, so downstream grouping/dedupe hashes them cheaply.
+T1078: Final = _technique("Credential Access", "T1078 - Valid Accounts")
+T1133: Final = _technique("Initial Access", "T1133 - External Remote Services")
+T1071: Final = _technique("Command and Control", "T1071 - Application Layer Protocol")
+T1566: Final = _technique("Initial Access", "T1566 - Phishing")
+
+
+_EMPTY: Dict[str, Any] = {}
+
+# Signal flags, computed once per call; rule clusters test bits instead of re-reading fields
+_F_LOGIN_ANOMALY = 1 << 0
+_F_IMPOSSIBLE_TRAVEL = 1 << 1
+_F_MFA_DISABLED = 1 << 2
+_F_HOSTING_ASN = 1 << 3
+_F_PRIOR_LINKED = 1 << 4
+_F_BULLETPROOF = 1 << 5
+_F_NEW_DOMAIN = 1 << 6
+_F_ABUSE_HIGH = 1 << 7
+_F_VT_HIGH = 1 << 8
+_F_VT_SUSPICIOUS = 1 << 9
+
+_F_REPUTATION_STRONG = _F_ABUSE_HIGH | _F_VT_HIGH
+
+
+# -----------------------------
+# Rules
+# -----------------------------
+# Each rule fires when any bit of `trigger` is set. Confidence starts at `base`;
+# every term whose flag is set appends its evidence (formatted with the signal
+# values) and adds its weight. The same table drives infer_mitre and the
+# vectorized infer_mitre_batch, so both produce identical results.
+
+class _Term(NamedTuple):
+    flag: int
+    weight: float
+    evidence: str
+
+
+class _Rule(NamedTuple):
+    trigger: int
+    base: float
+    terms: Tuple[_Term, ...]
+    tactic: str
+    technique: str
+
+
+_RULES: Tuple[_Rule, ...] = (
+    # --- Rule cluster 1: Valid Accounts (T1078) / Account compromise ---
+    # Common when you see login anomaly / impossible travel + weak auth posture (no MFA)
+    _Rule(
+        trigger=_F_LOGIN_ANOMALY,
+        base=0.55,
+        terms=(
+            _Term(_F_LOGIN_ANOMALY, 0.0, "Login anomaly detected (context.login_anomaly=true)"),
+            _Term(_F_IMPOSSIBLE_TRAVEL, 0.10, "Impossible travel signal present (context.impossible_travel=true)"),
+            _Term(_F_MFA_DISABLED, 0.10, "MFA not enabled (context.mfa_enabled=false)"),
+            _Term(_F_HOSTING_ASN, 0.05, "Source IP appears to be from hosting ASN (asn.type=hosting)"),
+            _Term(_F_PRIOR_LINKED, 0.05, "Entity linked to prior incidents (context.prior_incidents={prior_incidents})"),
+        ),
+        tactic=T1078.tactic,
+        technique=T1078.technique,
+    ),
+    # --- Rule cluster 2: External Remote Services (T1133) ---
+    # This is a reasonable companion hypothesis for anomalous logins where access path is external.
+    _Rule(
+        trigger=_F_LOGIN_ANOMALY,
+        base=0.45,
+        terms=(
+            _Term(_F_LOGIN_ANOMALY, 0.0, "Anomalous authentication pattern suggests external access path"),
+            _Term(_F_HOSTING_ASN, 0.10, "Login source is hosting/provider ASN (asn.type=hosting)"),
+            _Term(_F_IMPOSSIBLE_TRAVEL, 0.05, "Impossible travel increases likelihood of remote access misuse"),
+        ),
+        tactic=T1133.tactic,
+        technique=T1133.technique,
+    ),
+    # --- Rule cluster 3: Command and Control via Application Layer Protocol (T1071) ---
+    # Triggered by strong IP reputation indicators + hosting/bulletproof infra.
+    # Note: Without traffic telemetry, keep confidence moderate.
+    _Rule(
+        trigger=_F_REPUTATION_STRONG,
+        base=0.50,
+        terms=(
+            _Term(_F_ABUSE_HIGH, 0.0, "AbuseIPDB confidence high (abuseipdb.confidence={abuse_conf})"),
+            _Term(_F_VT_HIGH, 0.0, "VirusTotal malicious ratio high ({vt_mal}/{vt_total}={vt_ratio:.2%})"),
+            _Term(_F_HOSTING_ASN, 0.05, "Infrastructure characteristic: hosting ASN"),
+            _Term(_F_BULLETPROOF, 0.10, "Infrastructure characteristic: bulletproof hosting (asn.is_bulletproof=true)"),
+        ),
+        tactic=T1071.tactic,
+        technique=T1071.technique,
+    ),
+    # --- Rule cluster 4: Phishing (T1566) / Suspicious newly-registered domains ---
+    # If you have domain age (new) + reputation indicators, suggest phishing-related initial access.
+    _Rule(
+        trigger=_F_NEW_DOMAIN,
+        base=0.40,
+        terms=(
+            _Term(_F_NEW_DOMAIN, 0.0, "Domain is newly registered (whois.domain_age_days={domain_age_days})"),
+            _Term(_F_VT_SUSPICIOUS, 0.10, "VirusTotal indicates suspicious/malicious signals ({vt_mal}/{vt_total}={vt_ratio:.2%})"),
+        ),
+        tactic=T1566.tactic,
+        technique=T1566.technique,
+    ),
+)
 
 
 def _clamp01(x: float) -> float:
@@ -29,18 +142,158 @@ def _clamp01(x: float) -> float:
     return x
 
 
-def _add_hypothesis(
-    out: List[MitreHypothesis],
-    tactic: str,
-    technique: str,
-    confidence: float,
-    evidence: List[str],
-    min_conf: float
-) -> None:
-    conf = _clamp01(confidence)
-    if conf < min_conf:
-        return
-    out.append(MitreHypothesis(tactic=tactic, technique=technique, confidence=conf, evidence=evidence))
+def _read_signals(signals: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """
+    Returns (flags, values): the rule flags plus the raw values used in evidence text.
+    """
+    # --- Pull signals we care about (one lookup per section) ---
+    ctx = signals.get("context")
+    if not isinstance(ctx, dict):
+        ctx = _EMPTY
+    vt = signals.get("virustotal")
+    if not isinstance(vt, dict):
+        vt = _EMPTY
+    abuse = signals.get("abuseipdb")
+    if not isinstance(abuse, dict):
+        abuse = _EMPTY
+    whois = signals.get("whois")
+    if not isinstance(whois, dict):
+        whois = _EMPTY
+    asn = signals.get("asn")
+    if not isinstance(asn, dict):
+        asn = _EMPTY
+
+    prior_incidents = ctx.get("prior_incidents")
+    vt_mal = vt.get("malicious")
+    vt_total = vt.get("total")
+    abuse_conf = abuse.get("confidence")
+    domain_age_days = whois.get("domain_age_days")
+    asn_type = asn.get("type")
+
+    # Shared by clusters 3 and 4
+    vt_ratio = (
+        vt_mal / vt_total
+        if isinstance(vt_mal, int) and isinstance(vt_total, int) and vt_total > 0
+        else None
+    )
+
+    # "x is True" / "x is False" == isinstance(x, bool) and x / not x.
+    # Numeric fields use type(x) is int, as in scoring: a bool is not a count or an age.
+    flags = (
+        (_F_LOGIN_ANOMALY if ctx.get("login_anomaly") is True else 0)
+        | (_F_IMPOSSIBLE_TRAVEL if ctx.get("impossible_travel") is True else 0)
+        | (_F_MFA_DISABLED if ctx.get("mfa_enabled") is False else 0)
+        | (_F_HOSTING_ASN if isinstance(asn_type, str) and asn_type.lower() == "hosting" else 0)
+        | (_F_PRIOR_LINKED if type(prior_incidents) is int and prior_incidents >= 2 else 0)
+        | (_F_BULLETPROOF if asn.get("is_bulletproof") is True else 0)
+        | (_F_NEW_DOMAIN if type(domain_age_days) is int and domain_age_days <= 30 else 0)
+        | (_F_ABUSE_HIGH if type(abuse_conf) is int and abuse_conf >= 80 else 0)
+        | (_F_VT_HIGH if vt_ratio is not None and vt_ratio >= 0.10 else 0)
+        | (_F_VT_SUSPICIOUS if vt_ratio is not None and vt_ratio >= 0.03 else 0)
+    )
+
+    values = {
+        "prior_incidents": prior_incidents,
+        "vt_mal": vt_mal,
+        "vt_total": vt_total,
+        "vt_ratio": vt_ratio,
+        "abuse_conf": abuse_conf,
+        "domain_age_days": domain_age_days,
+    }
+    return flags, values
+
+
+def _evidence(rule: _Rule, flags: int, values: Dict[str, Any]) -> List[str]:
+    return [
+        text.format_map(values) if "{" in text else text
+        for flag, _, text in rule.terms
+        if flags & flag
+    ]
+
+
+# Output builders: (tactic, technique, confidence, evidence) -> hypothesis
+_Make = Callable[[str, str, float, List[str]], Any]
+
+
+def _hypothesis_dict(tactic: str, technique: str, confidence: float, evidence: List[str]) -> Dict[str, Any]:
+    return {"tactic": tactic, "technique": technique, "confidence": confidence, "evidence": evidence}
+
+
+_BY_ATTR = attrgetter("confidence")
+_BY_KEY = itemgetter("confidence")
+
+
+def _rank(out: List[Any], max_results: int, key: Callable[[Any], float]) -> List[Any]:
+    # --- Sort + cap results ---
+    out.sort(key=key, reverse=True)
+    return out[:max_results]
+
+
+def _infer(
+    signals: Dict[str, Any],
+    min_confidence: float,
+    max_results: int,
+    make: _Make,
+    key: Callable[[Any], float]
+) -> List[Any]:
+    out: List[Any] = []
+
+    flags, values = _read_signals(signals)
+    if not flags:
+        return out
+
+    for trigger, base, terms, tactic, technique in _RULES:
+        if not flags & trigger:
+            continue
+
+        conf = base
+        evidence: List[str] = []
+        for flag, weight, text in terms:
+            if flags & flag:
+                conf += weight
+                evidence.append(text.format_map(values) if "{" in text else text)
+
+        conf = _clamp01(conf)
+        if conf >= min_confidence:
+            out.append(make(tactic, technique, conf, evidence))
+
+    return _rank(out, max_results, key)
+
+
+def _infer_batch(
+    signals_list: List[Dict[str, Any]],
+    min_confidence: float,
+    max_results: int,
+    make: _Make,
+    key: Callable[[Any], float]
+) -> List[List[Any]]:
+    if np is None:
+        return [_infer(s, min_confidence, max_results, make, key) for s in signals_list]
+
+    n = len(signals_list)
+    read = [_read_signals(s) for s in signals_list]
+    flags = np.fromiter((f for f, _ in read), dtype=np.int64, count=n)
+
+    # Per rule: confidence column + survivor mask, accumulated in the same order as
+    # _infer (adding 0.0 for unset terms keeps the floats bit-identical).
+    confs = []
+    survives = []
+    for rule in _RULES:
+        conf = np.full(n, rule.base)
+        for term in rule.terms:
+            conf += term.weight * ((flags & term.flag) != 0)
+        np.clip(conf, 0.0, 1.0, out=conf)
+        confs.append(conf.tolist())
+        survives.append((((flags & rule.trigger) != 0) & (conf >= min_confidence)).tolist())
+
+    results: List[List[Any]] = [[] for _ in range(n)]
+    for r, rule in enumerate(_RULES):
+        conf_r = confs[r]
+        for i in (i for i, ok in enumerate(survives[r]) if ok):
+            item_flags, values = read[i]
+            results[i].append(make(rule.tactic, rule.technique, conf_r[i], _evidence(rule, item_flags, values)))
+
+    return [_rank(out, max_results, key) for out in results]
 
 
 def infer_mitre(
@@ -51,139 +304,42 @@ def infer_mitre(
     """
     Returns a ranked list of MITRE hypotheses (highest confidence first).
     """
-    out: List[MitreHypothesis] = []
+    return _infer(signals, min_confidence, max_results, MitreHypothesis, _BY_ATTR)
 
-    # --- Pull signals we care about ---
-    login_anomaly = _safe_get(signals, ("context", "login_anomaly"))
-    impossible_travel = _safe_get(signals, ("context", "impossible_travel"))
-    mfa_enabled = _safe_get(signals, ("context", "mfa_enabled"))
-    prior_incidents = _safe_get(signals, ("context", "prior_incidents"))
 
-    vt_mal = _safe_get(signals, ("virustotal", "malicious"))
-    vt_total = _safe_get(signals, ("virustotal", "total"))
-    abuse_conf = _safe_get(signals, ("abuseipdb", "confidence"))
-
-    domain_age_days = _safe_get(signals, ("whois", "domain_age_days"))
-    asn_type = _safe_get(signals, ("asn", "type"))
-    is_bulletproof = _safe_get(signals, ("asn", "is_bulletproof"))
-
-    # Helper booleans
-    prior_linked = isinstance(prior_incidents, int) and prior_incidents >= 2
-    hosting_asn = isinstance(asn_type, str) and asn_type.lower() == "hosting"
-    new_domain = isinstance(domain_age_days, int) and domain_age_days <= 30
+def infer_mitre_dicts(
+    signals: Dict[str, Any],
+    min_confidence: float = 0.35,
+    max_results: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Same as infer_mitre, but emits the pipeline's dict form directly
+    ({"tactic", "technique", "confidence", "evidence"}) without intermediate objects.
+    """
+    return _infer(signals, min_confidence, max_results, _hypothesis_dict, _BY_KEY)
 
-    # --- Rule cluster 1: Valid Accounts (T1078) / Account compromise ---
-    # Common when you see login anomaly / impossible travel + weak auth posture (no MFA)
-    if isinstance(login_anomaly, bool) and login_anomaly:
-        evidence = ["Login anomaly detected (context.login_anomaly=true)"]
-        conf = 0.55
-
-        if isinstance(impossible_travel, bool) and impossible_travel:
-            evidence.append("Impossible travel signal present (context.impossible_travel=true)")
-            conf += 0.10
-
-        if isinstance(mfa_enabled, bool) and not mfa_enabled:
-            evidence.append("MFA not enabled (context.mfa_enabled=false)")
-            conf += 0.10
-
-        if hosting_asn:
-            evidence.append("Source IP appears to be from hosting ASN (asn.type=hosting)")
-            conf += 0.05
-
-        if prior_linked:
-            evidence.append(f"Entity linked to prior incidents (context.prior_incidents={prior_incidents})")
-            conf += 0.05
-
-        _add_hypothesis(
-            out,
-            tactic="Credential Access",
-            technique="T1078 - Valid Accounts",
-            confidence=conf,
-            evidence=evidence,
-            min_conf=min_confidence
-        )
 
-    # --- Rule cluster 2: External Remote Services (T1133) ---
-    # This is a reasonable companion hypothesis for anomalous logins where access path is external.
-    if isinstance(login_anomaly, bool) and login_anomaly:
-        evidence = ["Anomalous authentication pattern suggests external access path"]
-        conf = 0.45
-
-        if hosting_asn:
-            evidence.append("Login source is hosting/provider ASN (asn.type=hosting)")
-            conf += 0.10
-
-        if isinstance(impossible_travel, bool) and impossible_travel:
-            evidence.append("Impossible travel increases likelihood of remote access misuse")
-            conf += 0.05
-
-        _add_hypothesis(
-            out,
-            tactic="Initial Access",
-            technique="T1133 - External Remote Services",
-            confidence=conf,
-            evidence=evidence,
-            min_conf=min_confidence
-        )
+def infer_mitre_batch(
+    signals_list: List[Dict[str, Any]],
+    min_confidence: float = 0.35,
+    max_results: int = 10
+) -> List[List[MitreHypothesis]]:
+    """
+    infer_mitre over many signal dicts (e.g. a SIEM alert flush), same results per item.
 
-    # --- Rule cluster 3: Command and Control via Application Layer Protocol (T1071) ---
-    # Triggered by strong IP reputation indicators + hosting/bulletproof infra.
-    # Note: Without traffic telemetry, keep confidence moderate.
-    rep_strong = False
-    rep_evidence: List[str] = []
-
-    if isinstance(abuse_conf, int) and abuse_conf >= 80:
-        rep_strong = True
-        rep_evidence.append(f"AbuseIPDB confidence high (abuseipdb.confidence={abuse_conf})")
-
-    if isinstance(vt_mal, int) and isinstance(vt_total, int) and vt_total > 0:
-        ratio = vt_mal / vt_total
-        if ratio >= 0.10:
-            rep_strong = True
-            rep_evidence.append(f"VirusTotal malicious ratio high ({vt_mal}/{vt_total}={ratio:.2%})")
-
-    if rep_strong:
-        evidence = rep_evidence.copy()
-        conf = 0.50
-
-        if hosting_asn:
-            evidence.append("Infrastructure characteristic: hosting ASN")
-            conf += 0.05
-
-        if isinstance(is_bulletproof, bool) and is_bulletproof:
-            evidence.append("Infrastructure characteristic: bulletproof hosting (asn.is_bulletproof=true)")
-            conf += 0.10
-
-        _add_hypothesis(
-            out,
-            tactic="Command and Control",
-            technique="T1071 - Application Layer Protocol",
-            confidence=conf,
-            evidence=evidence,
-            min_conf=min_confidence
-        )
+    Rule confidences and thresholds are evaluated column-wise with NumPy across the
+    whole batch; evidence strings are only built for hypotheses that survive.
+    Without NumPy this falls back to per-item inference.
+    """
+    return _infer_batch(signals_list, min_confidence, max_results, MitreHypothesis, _BY_ATTR)
 
-    # --- Rule cluster 4: Phishing (T1566) / Suspicious newly-registered domains ---
-    # If you have domain age (new) + reputation indicators, suggest phishing-related initial access.
-    if new_domain:
-        evidence = [f"Domain is newly registered (whois.domain_age_days={domain_age_days})"]
-        conf = 0.40
-
-        if isinstance(vt_mal, int) and isinstance(vt_total, int) and vt_total > 0:
-            ratio = vt_mal / vt_total
-            if ratio >= 0.03:
-                evidence.append(f"VirusTotal indicates suspicious/malicious signals ({vt_mal}/{vt_total}={ratio:.2%})")
-                conf += 0.10
-
-        _add_hypothesis(
-            out,
-            tactic="Initial Access",
-            technique="T1566 - Phishing",
-            confidence=conf,
-            evidence=evidence,
-            min_conf=min_confidence
-        )
 
-    # --- Sort + cap results ---
-    out.sort(key=lambda x: x.confidence, reverse=True)
-    return out[:max_results]
\ No newline at end of file
+def infer_mitre_dicts_batch(
+    signals_list: List[Dict[str, Any]],
+    min_confidence: float = 0.35,
+    max_results: int = 10
+) -> List[List[Dict[str, Any]]]:
+    """
+    Dict-emitting variant of infer_mitre_batch (see infer_mitre_dicts).
+    """
+    return _infer_batch(signals_list, min_confidence, max_results, _hypothesis_dict, _BY_KEY)
@@ -2,12 +2,16 @@ from __future__ import annotations
 from pathlib import Path
 
 import os
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.policy import evaluate_policy
 from core.policy_loader import load_policies
 from core.scoring import ScoringConfig, ScoreResult, score_confidence
-from core.mitre import MitreHypothesis, infer_mitre
+from core.mitre import infer_mitre_dicts, infer_mitre_dicts_batch
+
+
+_BASE_DIR = Path(__file__).resolve().parents[1]  # soc-triage-engine/
 
 
 class PipelineError(Exception):
@@ -20,17 +24,7 @@ def _require(incident: Dict[str, Any], key: str) -> Any:
     return incident[key]
 
 
-def run_pipeline(
-    incident: Dict[str, Any],
-    signals: Dict[str, Any],
-    scoring_cfg: Optional[ScoringConfig] = None,
-    mitre_min_confidence: float = 0.35,
-    mitre_max_results: int = 10
-) -> Dict[str, Any]:
-    """
-    Run deterministic triage pipeline.
-    """
-
+def _incident_block(incident: Dict[str, Any]) -> Dict[str, Any]:
     # ---- Minimal incident sanity checks ----
     incident_id = _require(incident, "incident_id")
     title = _require(incident, "title")
@@ -38,42 +32,48 @@ def run_pipeline(
     timestamp = _require(incident, "timestamp")
     source = _require(incident, "source")
 
-    # ---- Deterministic scoring ----
-    score_res: ScoreResult = score_confidence(signals, cfg=scoring_cfg)
+    return {
+        "incident_id": incident_id,
+        "source": source,
+        "title": title,
+        "severity": severity,
+        "timestamp": timestamp,
+        "entities": incident.get("entities", []),
+        "tags": incident.get("tags", []),
+        "environment": incident.get("environment"),
+        "notes": incident.get("notes"),
+    }
 
-    # ---- Deterministic MITRE inference ----
-    mitre_res = infer_mitre(
-        signals,
-        min_confidence=mitre_min_confidence,
-        max_results=mitre_max_results
-    )
 
-    mitre_out = [
-        {
-            "tactic": h.tactic,
-            "technique": h.technique,
-            "confidence": h.confidence,
-            "evidence": h.evidence
-        }
-        for h in mitre_res
-    ]
+@lru_cache(maxsize=16)
+def _policy_path(policy_file: str) -> str:
+    return str(_BASE_DIR / policy_file)
+
+
+def _configured_policies() -> Optional[List[Dict[str, Any]]]:
+    # Policy evaluation (optional)
+    # -----------------------------
+    policy_file = os.environ.get("POLICY_FILE")
+    policies = None
+
+    if policy_file:
+        policies = load_policies(_policy_path(policy_file))
 
+    return policies
+
+
+def _assemble_output(
+    incident_block: Dict[str, Any],
+    score_res: ScoreResult,
+    mitre_out: List[Dict[str, Any]],
+    policies: Optional[List[Dict[str, Any]]]
+) -> Dict[str, Any]:
     output: Dict[str, Any] = {
         "meta": {
             "engine_version": "v1",
             "mode": "deterministic",
         },
-        "incident": {
-            "incident_id": incident_id,
-            "source": source,
-            "title": title,
-            "severity": severity,
-            "timestamp": timestamp,
-            "entities": incident.get("entities", []),
-            "tags": incident.get("tags", []),
-            "environment": incident.get("environment"),
-            "notes": incident.get("notes"),
-        },
+        "incident": incident_block,
         "scoring": {
             "score": score_res.score,
             "level": score_res.level,
@@ -83,19 +83,66 @@ def run_pipeline(
         "mitre": mitre_out,
     }
 
-   
-    # Policy evaluation (optional)
-    # -----------------------------
-    policy_file = os.getenv("POLICY_FILE")
-    policies = None
-
-    if policy_file:
-        base_dir = Path(__file__).resolve().parents[1]  # soc-triage-engine/
-        policy_path = base_dir / policy_file
-        policies = load_policies(str(policy_path))
-
     policy_decision = evaluate_policy(output, policies)
     output["policy"] = policy_decision.to_dict()
 
     return output
 
+
+def run_pipeline(
+    incident: Dict[str, Any],
+    signals: Dict[str, Any],
+    scoring_cfg: Optional[ScoringConfig] = None,
+    mitre_min_confidence: float = 0.35,
+    mitre_max_results: int = 10
+) -> Dict[str, Any]:
+    """
+    Run deterministic triage pipeline.
+    """
+    incident_block = _incident_block(incident)
+
+    # ---- Deterministic scoring ----
+    score_res: ScoreResult = score_confidence(signals, cfg=scoring_cfg, return_signals_used=True)
+
+    # ---- Deterministic MITRE inference ----
+    mitre_out = infer_mitre_dicts(
+        signals,
+        min_confidence=mitre_min_confidence,
+        max_results=mitre_max_results
+    )
+
+    return _assemble_output(incident_block, score_res, mitre_out, _configured_policies())
+
+
+def run_pipeline_batch(
+    items: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    scoring_cfg: Optional[ScoringConfig] = None,
+    mitre_min_confidence: float = 0.35,
+    mitre_max_results: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Run the deterministic pipeline over (incident, signals) pairs.
+    Same output per item as run_pipeline; MITRE inference is vectorized across the batch
+    and policies are loaded once.
+    """
+    incident_blocks = []
+    for i, (incident, _) in enumerate(items):
+        try:
+            incident_blocks.append(_incident_block(incident))
+        except PipelineError as e:
+            raise PipelineError(f"items[{i}]: {e}") from e
+
+    signals_list = [signals for _, signals in items]
+
+    mitre_batch = infer_mitre_dicts_batch(
+        signals_list,
+        min_confidence=mitre_min_confidence,
+        max_results=mitre_max_results
+    )
+
+    policies = _configured_policies()
+
+    return [
+        _assemble_output(block, score_confidence(signals, cfg=scoring_cfg, return_signals_used=True), mitre_out, policies)
+        for block, signals, mitre_out in zip(incident_blocks, signals_list, mitre_batch)
+    ]
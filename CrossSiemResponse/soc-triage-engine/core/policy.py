@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Set
 
 
 class PolicyDecision:
@@ -53,18 +53,22 @@ def evaluate_policy(
     risk_score = scoring.get("score", 0)
     risk_level = scoring.get("level", "low")
 
-    allowed_actions = ["monitor", "investigate"]
-    denied_actions: List[str] = []
+    # Insertion-ordered dicts used as sets: O(1) membership, stable output order
+    allowed_actions: Dict[str, None] = dict.fromkeys(("monitor", "investigate"))
+    denied_actions: Dict[str, None] = {}
     reasons: List[str] = []
     requires_approval = False
 
     # Default baseline policy
     if risk_level == "high":
-        allowed_actions.extend(["contain", "reset_credentials"])
+        allowed_actions.update(dict.fromkeys(("contain", "reset_credentials")))
         reasons.append("High-risk incident allows containment actions.")
 
     # Apply custom policies (if any)
     if policies:
+        # Built on the first rule that filters by entity type
+        entity_types: Optional[Set[str]] = None
+
         for rule in policies:
             when = rule.get("when", {})
             effect = rule.get("effect", {})
@@ -78,7 +82,9 @@ def evaluate_policy(
                 continue
 
             if entity_type:
-                if not any(e.get("type") == entity_type for e in entities):
+                if entity_types is None:
+                    entity_types = _entity_types(entities)
+                if entity_type not in entity_types:
                     continue
 
             # ---- Effects ----
@@ -86,13 +92,8 @@ def evaluate_policy(
             allow = effect.get("allow_actions", [])
             approval = effect.get("require_approval", False)
 
-            for a in deny:
-                if a not in denied_actions:
-                    denied_actions.append(a)
-
-            for a in allow:
-                if a not in allowed_actions:
-                    allowed_actions.append(a)
+            denied_actions.update(dict.fromkeys(deny))
+            allowed_actions.update(dict.fromkeys(allow))
 
             if approval:
                 requires_approval = True
@@ -100,11 +101,20 @@ def evaluate_policy(
             reasons.append(reason)
 
     # Final cleanup
-    allowed_actions = [a for a in allowed_actions if a not in denied_actions]
-
     return PolicyDecision(
-        allowed_actions=allowed_actions,
-        denied_actions=denied_actions,
+        allowed_actions=[a for a in allowed_actions if a not in denied_actions],
+        denied_actions=list(denied_actions),
         requires_approval=requires_approval,
         reasons=reasons,
     )
+
+
+def _entity_types(entities: List[Any]) -> Set[str]:
+    # Malformed entities (non-dicts, non-string types) can never match a rule
+    types: Set[str] = set()
+    for e in entities:
+        if isinstance(e, dict):
+            t = e.get("type")
+            if isinstance(t, str):
+                types.add(t)
+    return types
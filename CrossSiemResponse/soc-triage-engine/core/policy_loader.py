@@ -1,24 +1,44 @@
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
 try:
     import yaml
 except ImportError:
     yaml = None
 
+# libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", None) or getattr(yaml, "SafeLoader", None)
+
+# Parsed policy files keyed by absolute path -> (mtime_ns, policies).
+# Policies are read-only downstream; edits on disk invalidate via mtime.
+_CACHE: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
 
-def load_policies(path: str) -> List[Dict[str, Any]]:
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"Policy file not found: {path}")
 
+def _parse(p: Path) -> List[Dict[str, Any]]:
     if p.suffix in (".yaml", ".yml"):
         if not yaml:
             raise RuntimeError("PyYAML not installed")
-        return yaml.safe_load(p.read_text())
+        return yaml.load(p.read_bytes(), Loader=_YAML_LOADER)
 
     if p.suffix == ".json":
-        return json.loads(p.read_text())
+        return json.loads(p.read_bytes())
 
     raise ValueError("Policy file must be .json or .yaml")
+
+
+def load_policies(path: str) -> List[Dict[str, Any]]:
+    p = Path(path)
+    try:
+        mtime = p.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Policy file not found: {path}") from None
+
+    key = str(p.resolve())
+    cached = _CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    policies = _parse(p)
+    _CACHE[key] = (mtime, policies)
+    return policies
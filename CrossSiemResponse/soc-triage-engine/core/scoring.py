@@ -1,7 +1,24 @@
 from __future__ import annotations
 
+import importlib.util
+import threading
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Numba is only imported (and the batch kernels jitted) on the first batch call;
+# importing it costs ~150ms that non-batch users (pipeline, API startup) never need.
+_NUMBA_AVAILABLE = np is not None and importlib.util.find_spec("numba") is not None
+_NUMBA_KERNELS_READY = False
+_numba_lock = threading.Lock()
+
+# Replaced by numba.prange when the kernels are jitted
+prange = range
 
 
 # -----------------------------
@@ -48,23 +65,164 @@ class ScoringConfig:
     # 70+ => high
 
 
-@dataclass
+# Reason codes -> display text, formatted with (value, weight) only when read
+_REASON_TEMPLATES: Dict[str, str] = {
+    "vt_high": "VirusTotal malicious ratio high ({0:.2%}) +{1}",
+    "vt_moderate": "VirusTotal malicious ratio moderate ({0:.2%}) +{1}",
+    "abuse_high": "AbuseIPDB confidence high ({0}) +{1}",
+    "abuse_moderate": "AbuseIPDB confidence moderate ({0}) +{1}",
+    "domain_very_new": "Domain very new ({0}d) +{1}",
+    "domain_new": "Domain newly registered ({0}d) +{1}",
+    "asn_hosting": "ASN appears to be hosting provider +{1}",
+    "asn_bulletproof": "ASN flagged as bulletproof hosting +{1}",
+    "login_anomaly": "Login anomaly detected +{1}",
+    "mfa_disabled": "MFA not enabled for account +{1}",
+    "prior_incidents": "Entity linked to prior incidents ({0}) +{1}",
+    "no_signals": "No strong deterministic signals found; defaulting to low confidence",
+}
+
+# (code, value, weight)
+Reason = Tuple[str, Any, int]
+
+
+@dataclass(slots=True)
 class ScoreResult:
     score: int
     level: str  # low|medium|high
-    reasons: List[str] = field(default_factory=list)
+    reason_codes: List[Reason] = field(default_factory=list)
     signals_used: Dict[str, Any] = field(default_factory=dict)
+    # Rendered reasons, filled on first access of .reasons (slots leave no __dict__ for cached_property)
+    _reasons: Optional[List[str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def render_reasons(self, limit: Optional[int] = None) -> List[str]:
+        """
+        Human-readable reasons (optionally only the first `limit`).
+        """
+        codes = self.reason_codes if limit is None else self.reason_codes[:limit]
+        return [_REASON_TEMPLATES[code].format(value, weight) for code, value, weight in codes]
+
+    @property
+    def reasons(self) -> List[str]:
+        rendered = self._reasons
+        if rendered is None:
+            rendered = self.render_reasons()
+            self._reasons = rendered
+        return rendered
+
+
+@dataclass
+class ScoreBatch:
+    """
+    Scores/levels for a batch of signal dicts, in input order.
+    Reasons and signals_used are only built for items the caller inspects via result(i),
+    once per item.
+    """
+    scores: List[int]
+    levels: List[str]  # low|medium|high
+    signals_list: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    cfg: Optional[ScoringConfig] = field(default=None, repr=False)
+    _results: Dict[int, ScoreResult] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def result(self, i: int) -> ScoreResult:
+        res = self._results.get(i)
+        if res is None:
+            res = self._results[i] = score_confidence(self.signals_list[i], self.cfg, return_signals_used=True)
+        return res
+
+
+class _CompiledCfg(NamedTuple):
+    """
+    Flat read-only view of a ScoringConfig for the scoring hot path.
+    Field names match ScoringConfig; *_weights are (none, moderate, high) tier tuples.
+    """
+    vt_malicious_ratio_high: float
+    vt_malicious_ratio_med: float
+    vt_weights: Tuple[int, int, int]
+    abuse_conf_high: int
+    abuse_conf_med: int
+    abuse_weights: Tuple[int, int, int]
+    domain_new_days: int
+    domain_very_new_days: int
+    domain_weights: Tuple[int, int, int]
+    wt_asn_hosting: int
+    wt_asn_bulletproof: int
+    wt_login_anomaly: int
+    wt_mfa_disabled: int
+    wt_prior_incidents: int
+    prior_incidents_threshold: int
+    min_score: int
+    max_score: int
+    level_low_max: int
+    level_medium_max: int
+    level_lut: Optional[Tuple[str, ...]]  # level by (clamped score - min_score)
+    empty_score: int  # score/level when no signal applies
+    empty_level: str
+
+
+def _compile_cfg(cfg: ScoringConfig) -> _CompiledCfg:
+    empty_score = max(cfg.min_score, min(cfg.max_score, 0))
+    return _CompiledCfg(
+        vt_malicious_ratio_high=cfg.vt_malicious_ratio_high,
+        vt_malicious_ratio_med=cfg.vt_malicious_ratio_med,
+        vt_weights=(0, cfg.wt_vt_med, cfg.wt_vt_high),
+        abuse_conf_high=cfg.abuse_conf_high,
+        abuse_conf_med=cfg.abuse_conf_med,
+        abuse_weights=(0, cfg.wt_abuse_med, cfg.wt_abuse_high),
+        domain_new_days=cfg.domain_new_days,
+        domain_very_new_days=cfg.domain_very_new_days,
+        domain_weights=(0, cfg.wt_domain_new, cfg.wt_domain_very_new),
+        wt_asn_hosting=cfg.wt_asn_hosting,
+        wt_asn_bulletproof=cfg.wt_asn_bulletproof,
+        wt_login_anomaly=cfg.wt_login_anomaly,
+        wt_mfa_disabled=cfg.wt_mfa_disabled,
+        wt_prior_incidents=cfg.wt_prior_incidents,
+        prior_incidents_threshold=cfg.prior_incidents_threshold,
+        min_score=cfg.min_score,
+        max_score=cfg.max_score,
+        level_low_max=cfg.level_low_max,
+        level_medium_max=cfg.level_medium_max,
+        level_lut=_level_lut(cfg),
+        empty_score=empty_score,
+        empty_level=_score_level(empty_score, cfg),
+    )
+
+
+# Compiled views keyed by id(cfg). The entry keeps its config alive (so the id
+# cannot be reused while cached) and is identity-checked on lookup; hashing the
+# frozen dataclass per call would cost about as much as the lookups it saves.
+# On an id miss the config is looked up by value, so callers building a fresh but
+# equal ScoringConfig per call share one compiled view instead of recompiling.
+_COMPILED_CFGS: Dict[int, Tuple[ScoringConfig, _CompiledCfg]] = {}
+_COMPILED_BY_VALUE: Dict[ScoringConfig, _CompiledCfg] = {}
+_COMPILED_CFGS_MAX = 8
+
+
+def _compiled(cfg: Optional[ScoringConfig]) -> _CompiledCfg:
+    if cfg is None:
+        return _COMPILED_DEFAULT
+    entry = _COMPILED_CFGS.get(id(cfg))
+    if entry is not None and entry[0] is cfg:
+        return entry[1]
+    if len(_COMPILED_CFGS) >= _COMPILED_CFGS_MAX:
+        _COMPILED_CFGS.clear()
+    compiled = _COMPILED_BY_VALUE.get(cfg)
+    if compiled is None:
+        if len(_COMPILED_BY_VALUE) >= _COMPILED_CFGS_MAX:
+            _COMPILED_BY_VALUE.clear()
+        compiled = _compile_cfg(cfg)
+        _COMPILED_BY_VALUE[cfg] = compiled
+    _COMPILED_CFGS[id(cfg)] = (cfg, compiled)
+    return compiled
 
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
-def _clamp(n: int, lo: int, hi: int) -> int:
-    return max(lo, min(hi, n))
-
-
-def _score_level(score: int, cfg: ScoringConfig) -> str:
+def _score_level(score: int, cfg: Union[ScoringConfig, _CompiledCfg]) -> str:
     if score <= cfg.level_low_max:
         return "low"
     if score <= cfg.level_medium_max:
@@ -72,16 +230,36 @@ def _score_level(score: int, cfg: ScoringConfig) -> str:
     return "high"
 
 
-def _safe_get(d: Dict[str, Any], path: Tuple[str, ...], default: Any = None) -> Any:
-    cur: Any = d
-    for key in path:
-        if not isinstance(cur, dict) or key not in cur:
-            return default
-        cur = cur[key]
-    return cur
+# Score ranges wider than this (unusual custom caps) use comparisons instead of a table
+_LEVEL_LUT_MAX = 1000
+
 
+def _level_lut(cfg: ScoringConfig) -> Optional[Tuple[str, ...]]:
+    """
+    Level for every score the clamp can produce, indexed by score - min_score.
+    """
+    lo = cfg.min_score
+    hi = max(cfg.min_score, cfg.max_score)
+    if hi - lo > _LEVEL_LUT_MAX:
+        return None
+    return tuple(_score_level(score, cfg) for score in range(lo, hi + 1))
+
+
+# Shared default config (frozen, so safe to reuse) and its compiled view
+_DEFAULT_CFG = ScoringConfig()
+_COMPILED_DEFAULT = _compile_cfg(_DEFAULT_CFG)
+
+_EMPTY: Dict[str, Any] = {}
 
-def _parse_vt_ratio(vt: Dict[str, Any]) -> Optional[float]:
+# Reason codes for the two-threshold ladders, by tier (tier 0 = below both thresholds)
+_VT_CODES = ("", "vt_moderate", "vt_high")
+_ABUSE_CODES = ("", "abuse_moderate", "abuse_high")
+_DOMAIN_AGE_CODES = ("", "domain_new", "domain_very_new")
+
+_NO_SIGNALS: Reason = ("no_signals", None, 0)
+
+
+def _parse_vt_ratio(vt: Any) -> Optional[float]:
     """
     Accepts either:
       vt = {"malicious": 12, "total": 94}
@@ -113,7 +291,8 @@ def _parse_vt_ratio(vt: Dict[str, Any]) -> Optional[float]:
 
 def score_confidence(
     signals: Dict[str, Any],
-    cfg: Optional[ScoringConfig] = None
+    cfg: Optional[ScoringConfig] = None,
+    return_signals_used: bool = False
 ) -> ScoreResult:
     """
     signals: normalized dict produced by your enrichment/normalization layer, e.g.:
@@ -125,92 +304,465 @@ def score_confidence(
       "asn": {"type": "hosting", "is_bulletproof": false},
       "context": {"login_anomaly": true, "mfa_enabled": false, "prior_incidents": 2}
     }
-    """
-    cfg = cfg or ScoringConfig()
-    score = 0
-    reasons: List[str] = []
 
-    # Track which signals we actually used for transparency/debugging
-    used: Dict[str, Any] = {}
+    return_signals_used: also fill ScoreResult.signals_used (left empty otherwise).
+    """
+    c = _compiled(cfg)
+    if not signals:
+        # Nothing enriched yet: fresh result from the precomputed empty score
+        return ScoreResult(score=c.empty_score, level=c.empty_level, reason_codes=[_NO_SIGNALS])
 
-    # --- VirusTotal ---
-    vt = signals.get("virustotal", {})
-    vt_ratio = _parse_vt_ratio(vt)
+    score = 0
+    reasons: List[Reason] = []
+
+    # --- Pull signal sections (one lookup each; non-dict sections count as absent) ---
+    abuse = signals.get("abuseipdb")
+    if not isinstance(abuse, dict):
+        abuse = _EMPTY
+    whois = signals.get("whois")
+    if not isinstance(whois, dict):
+        whois = _EMPTY
+    asn = signals.get("asn")
+    if not isinstance(asn, dict):
+        asn = _EMPTY
+    ctx = signals.get("context")
+    if not isinstance(ctx, dict):
+        ctx = _EMPTY
+
+    # --- VirusTotal (inlined _parse_vt_ratio; clamp only values outside [0, 1]) ---
+    vt_ratio = None
+    vt = signals.get("virustotal")
+    if isinstance(vt, dict):
+        ratio = vt.get("malicious_ratio")
+        if isinstance(ratio, (int, float)):
+            vt_ratio = float(ratio) if 0 <= ratio <= 1 else (0.0 if ratio < 0 else min(float(ratio), 1.0))
+        else:
+            mal = vt.get("malicious")
+            total = vt.get("total")
+            if isinstance(mal, (int, float)) and isinstance(total, (int, float)) and total > 0:
+                vt_ratio = float(mal) / float(total)
+                if not 0.0 < vt_ratio <= 1.0:  # (max() also turns -0.0 into 0.0)
+                    vt_ratio = max(0.0, min(vt_ratio, 1.0))
     if vt_ratio is not None:
-        used["virustotal"] = {"malicious_ratio": vt_ratio}
-        if vt_ratio >= cfg.vt_malicious_ratio_high:
-            score += cfg.wt_vt_high
-            reasons.append(f"VirusTotal malicious ratio high ({vt_ratio:.2%}) +{cfg.wt_vt_high}")
-        elif vt_ratio >= cfg.vt_malicious_ratio_med:
-            score += cfg.wt_vt_med
-            reasons.append(f"VirusTotal malicious ratio moderate ({vt_ratio:.2%}) +{cfg.wt_vt_med}")
+        # tier: 2 = high, 1 = moderate, 0 = none (`or` keeps the high tier winning)
+        tier = (vt_ratio >= c.vt_malicious_ratio_high) * 2 or (vt_ratio >= c.vt_malicious_ratio_med)
+        if tier:
+            wt = c.vt_weights[tier]
+            score += wt
+            reasons.append((_VT_CODES[tier], vt_ratio, wt))
 
     # --- AbuseIPDB ---
-    abuse = signals.get("abuseipdb", {})
     abuse_conf = abuse.get("confidence")
-    if isinstance(abuse_conf, int):
-        used["abuseipdb"] = {"confidence": abuse_conf}
-        if abuse_conf >= cfg.abuse_conf_high:
-            score += cfg.wt_abuse_high
-            reasons.append(f"AbuseIPDB confidence high ({abuse_conf}) +{cfg.wt_abuse_high}")
-        elif abuse_conf >= cfg.abuse_conf_med:
-            score += cfg.wt_abuse_med
-            reasons.append(f"AbuseIPDB confidence moderate ({abuse_conf}) +{cfg.wt_abuse_med}")
+    # Exact type checks: counts must be real ints (not bools), flags real bools
+    if type(abuse_conf) is int:
+        tier = (abuse_conf >= c.abuse_conf_high) * 2 or (abuse_conf >= c.abuse_conf_med)
+        if tier:
+            wt = c.abuse_weights[tier]
+            score += wt
+            reasons.append((_ABUSE_CODES[tier], abuse_conf, wt))
+    else:
+        abuse_conf = None
 
     # --- Domain age (if present) ---
-    domain_age_days = _safe_get(signals, ("whois", "domain_age_days"))
-    if isinstance(domain_age_days, int):
-        used.setdefault("whois", {})["domain_age_days"] = domain_age_days
-        if domain_age_days <= cfg.domain_very_new_days:
-            score += cfg.wt_domain_very_new
-            reasons.append(f"Domain very new ({domain_age_days}d) +{cfg.wt_domain_very_new}")
-        elif domain_age_days <= cfg.domain_new_days:
-            score += cfg.wt_domain_new
-            reasons.append(f"Domain newly registered ({domain_age_days}d) +{cfg.wt_domain_new}")
+    domain_age_days = whois.get("domain_age_days")
+    if type(domain_age_days) is int:
+        tier = (domain_age_days <= c.domain_very_new_days) * 2 or (domain_age_days <= c.domain_new_days)
+        if tier:
+            wt = c.domain_weights[tier]
+            score += wt
+            reasons.append((_DOMAIN_AGE_CODES[tier], domain_age_days, wt))
+    else:
+        domain_age_days = None
 
     # --- ASN context ---
-    asn_type = _safe_get(signals, ("asn", "type"))
-    is_bulletproof = _safe_get(signals, ("asn", "is_bulletproof"))
+    asn_type = asn.get("type")
     if isinstance(asn_type, str):
-        used.setdefault("asn", {})["type"] = asn_type
         if asn_type.lower() == "hosting":
-            score += cfg.wt_asn_hosting
-            reasons.append(f"ASN appears to be hosting provider +{cfg.wt_asn_hosting}")
+            score += c.wt_asn_hosting
+            reasons.append(("asn_hosting", asn_type, c.wt_asn_hosting))
+    else:
+        asn_type = None
 
-    if isinstance(is_bulletproof, bool):
-        used.setdefault("asn", {})["is_bulletproof"] = is_bulletproof
+    is_bulletproof = asn.get("is_bulletproof")
+    if type(is_bulletproof) is bool:
         if is_bulletproof:
-            score += cfg.wt_asn_bulletproof
-            reasons.append(f"ASN flagged as bulletproof hosting +{cfg.wt_asn_bulletproof}")
+            score += c.wt_asn_bulletproof
+            reasons.append(("asn_bulletproof", True, c.wt_asn_bulletproof))
+    else:
+        is_bulletproof = None
 
     # --- Incident context ---
-    login_anomaly = _safe_get(signals, ("context", "login_anomaly"))
-    mfa_enabled = _safe_get(signals, ("context", "mfa_enabled"))
-    prior_incidents = _safe_get(signals, ("context", "prior_incidents"))
-
-    if isinstance(login_anomaly, bool):
-        used.setdefault("context", {})["login_anomaly"] = login_anomaly
+    login_anomaly = ctx.get("login_anomaly")
+    if type(login_anomaly) is bool:
         if login_anomaly:
-            score += cfg.wt_login_anomaly
-            reasons.append(f"Login anomaly detected +{cfg.wt_login_anomaly}")
+            score += c.wt_login_anomaly
+            reasons.append(("login_anomaly", True, c.wt_login_anomaly))
+    else:
+        login_anomaly = None
 
-    if isinstance(mfa_enabled, bool):
-        used.setdefault("context", {})["mfa_enabled"] = mfa_enabled
+    mfa_enabled = ctx.get("mfa_enabled")
+    if type(mfa_enabled) is bool:
         if not mfa_enabled:
-            score += cfg.wt_mfa_disabled
-            reasons.append(f"MFA not enabled for account +{cfg.wt_mfa_disabled}")
+            score += c.wt_mfa_disabled
+            reasons.append(("mfa_disabled", False, c.wt_mfa_disabled))
+    else:
+        mfa_enabled = None
+
+    prior_incidents = ctx.get("prior_incidents")
+    if type(prior_incidents) is int:
+        if prior_incidents >= c.prior_incidents_threshold:
+            score += c.wt_prior_incidents
+            reasons.append(("prior_incidents", prior_incidents, c.wt_prior_incidents))
+    else:
+        prior_incidents = None
+
+    # Track which signals we actually used for transparency/debugging, on request
+    # (each local above is its valid value or None)
+    used: Dict[str, Any] = {}
+    if return_signals_used:
+        if vt_ratio is not None:
+            used["virustotal"] = {"malicious_ratio": vt_ratio}
+        if abuse_conf is not None:
+            used["abuseipdb"] = {"confidence": abuse_conf}
+        if domain_age_days is not None:
+            used["whois"] = {"domain_age_days": domain_age_days}
+        if asn_type is not None:
+            used["asn"] = {"type": asn_type}
+        if is_bulletproof is not None:
+            used.setdefault("asn", {})["is_bulletproof"] = is_bulletproof
+        if login_anomaly is not None:
+            used["context"] = {"login_anomaly": login_anomaly}
+        if mfa_enabled is not None:
+            used.setdefault("context", {})["mfa_enabled"] = mfa_enabled
+        if prior_incidents is not None:
+            used.setdefault("context", {})["prior_incidents"] = prior_incidents
+
+    # Finalize: clamp as max(lo, min(hi, n)), inline
+    if score > c.max_score:
+        score = c.max_score
+    if score < c.min_score:
+        score = c.min_score
+    lut = c.level_lut
+    level = lut[score - c.min_score] if lut is not None else _score_level(score, c)
 
-    if isinstance(prior_incidents, int):
-        used.setdefault("context", {})["prior_incidents"] = prior_incidents
-        if prior_incidents >= cfg.prior_incidents_threshold:
-            score += cfg.wt_prior_incidents
-            reasons.append(f"Entity linked to prior incidents ({prior_incidents}) +{cfg.wt_prior_incidents}")
+    if not reasons:
+        reasons.append(_NO_SIGNALS)
 
-    # Finalize
-    score = _clamp(score, cfg.min_score, cfg.max_score)
-    level = _score_level(score, cfg)
+    # Reason text is rendered lazily (ScoreResult.reasons)
+    return ScoreResult(score=score, level=level, reason_codes=reasons, signals_used=used)
 
-    if not reasons:
-        reasons.append("No strong deterministic signals found; defaulting to low confidence")
+# -----------------------------
+# Batch scoring
+# -----------------------------
+
+_NAN = float("nan")
+_LEVELS = ("low", "medium", "high")
+
+# Boolean signals packed into one flags column
+_B_HOSTING = 1
+_B_BULLETPROOF = 2
+_B_LOGIN_ANOMALY = 4
+_B_MFA_DISABLED = 8
 
-    return ScoreResult(score=score, level=level, reasons=reasons, signals_used=used)
\ No newline at end of file
+# Kernel parameter layout (see _kernel_params)
+_T_VT_HIGH, _T_VT_MED, _T_ABUSE_HIGH, _T_ABUSE_MED, _T_DOMAIN_VERY_NEW, _T_DOMAIN_NEW, \
+    _T_PRIOR = range(7)
+_W_VT_HIGH, _W_VT_MED, _W_ABUSE_HIGH, _W_ABUSE_MED, _W_DOMAIN_VERY_NEW, _W_DOMAIN_NEW, \
+    _W_ASN_HOSTING, _W_ASN_BULLETPROOF, _W_LOGIN_ANOMALY, _W_MFA_DISABLED, _W_PRIOR, \
+    _W_MIN_SCORE, _W_MAX_SCORE = range(13)
+
+
+@lru_cache(maxsize=8)
+def _kernel_params(cfg: ScoringConfig) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    (thresholds float64, weights int64) for the batch kernels, built once per config.
+    """
+    thresh = np.array([
+        cfg.vt_malicious_ratio_high, cfg.vt_malicious_ratio_med,
+        cfg.abuse_conf_high, cfg.abuse_conf_med,
+        cfg.domain_very_new_days, cfg.domain_new_days,
+        cfg.prior_incidents_threshold,
+    ], dtype=np.float64)
+    weights = np.array([
+        cfg.wt_vt_high, cfg.wt_vt_med,
+        cfg.wt_abuse_high, cfg.wt_abuse_med,
+        cfg.wt_domain_very_new, cfg.wt_domain_new,
+        cfg.wt_asn_hosting, cfg.wt_asn_bulletproof,
+        cfg.wt_login_anomaly, cfg.wt_mfa_disabled, cfg.wt_prior_incidents,
+        cfg.min_score, cfg.max_score,
+    ], dtype=np.int64)
+    return thresh, weights
+
+
+def _score_kernel_py(vt, abuse, age, flags, prior, thresh, weights):
+    """
+    Weighted sum for one packed alert (before clamping). NaN = signal absent.
+    """
+    score = 0
+
+    if vt >= thresh[_T_VT_HIGH]:
+        score += weights[_W_VT_HIGH]
+    elif vt >= thresh[_T_VT_MED]:
+        score += weights[_W_VT_MED]
+
+    if abuse >= thresh[_T_ABUSE_HIGH]:
+        score += weights[_W_ABUSE_HIGH]
+    elif abuse >= thresh[_T_ABUSE_MED]:
+        score += weights[_W_ABUSE_MED]
+
+    if age <= thresh[_T_DOMAIN_VERY_NEW]:
+        score += weights[_W_DOMAIN_VERY_NEW]
+    elif age <= thresh[_T_DOMAIN_NEW]:
+        score += weights[_W_DOMAIN_NEW]
+
+    if flags & _B_HOSTING:
+        score += weights[_W_ASN_HOSTING]
+    if flags & _B_BULLETPROOF:
+        score += weights[_W_ASN_BULLETPROOF]
+    if flags & _B_LOGIN_ANOMALY:
+        score += weights[_W_LOGIN_ANOMALY]
+    if flags & _B_MFA_DISABLED:
+        score += weights[_W_MFA_DISABLED]
+
+    if prior >= thresh[_T_PRIOR]:
+        score += weights[_W_PRIOR]
+
+    return score
+
+
+def _score_batch_kernel_py(vt, abuse, age, flags, prior, thresh, weights, out_score):
+    for i in range(vt.shape[0]):
+        score = _score_kernel(vt[i], abuse[i], age[i], flags[i], prior[i], thresh, weights)
+        out_score[i] = max(weights[_W_MIN_SCORE], min(weights[_W_MAX_SCORE], score))
+
+
+# A separate def from the serial kernel: numba keys its on-disk cache by function
+# name and line, not by the parallel flag, so sharing one def shares one cache entry.
+def _score_batch_kernel_parallel_py(vt, abuse, age, flags, prior, thresh, weights, out_score):
+    # Items are independent: prange splits the loop across cores
+    for i in prange(vt.shape[0]):
+        score = _score_kernel(vt[i], abuse[i], age[i], flags[i], prior[i], thresh, weights)
+        out_score[i] = max(weights[_W_MIN_SCORE], min(weights[_W_MAX_SCORE], score))
+
+
+# Numba dispatchers, published by _load_numba_kernels
+_score_kernel = None
+_score_batch_kernel = None
+_score_batch_kernel_parallel = None
+
+
+def _load_numba_kernels() -> bool:
+    """
+    Import numba and jit the batch kernels once; False if numba fails to import.
+    cache=True persists the machine code across runs. Compilation happens on the
+    first call, when the batch kernel resolves _score_kernel and prange as globals,
+    so every dispatcher is built before any of them is published.
+    """
+    global _NUMBA_AVAILABLE, _NUMBA_KERNELS_READY
+    global _score_kernel, _score_batch_kernel, _score_batch_kernel_parallel, prange
+
+    if _NUMBA_KERNELS_READY:
+        return True
+    with _numba_lock:
+        if _NUMBA_KERNELS_READY:
+            return True
+        try:
+            from numba import njit, prange as numba_prange
+        except ImportError:
+            _NUMBA_AVAILABLE = False
+            return False
+
+        score_kernel = njit(cache=True)(_score_kernel_py)
+        batch_kernel = njit(cache=True)(_score_batch_kernel_py)
+        batch_kernel_parallel = njit(parallel=True, cache=True)(_score_batch_kernel_parallel_py)
+
+        prange = numba_prange
+        _score_kernel = score_kernel
+        _score_batch_kernel = batch_kernel
+        _score_batch_kernel_parallel = batch_kernel_parallel
+        _NUMBA_KERNELS_READY = True
+    return True
+
+
+# Below this many items thread start-up outweighs the work; the serial kernel is used
+_PARALLEL_MIN_ITEMS = 8192
+
+
+def _column(values: List[Any]) -> "np.ndarray":
+    """
+    float64 column; NaN marks a missing/invalid signal (compares False everywhere).
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except OverflowError:
+        # ints beyond float range: saturate, comparisons against thresholds are unchanged
+        return np.array(
+            [v if isinstance(v, float) else float(max(-1e308, min(v, 1e308))) for v in values],
+            dtype=np.float64,
+        )
+
+
+def _as_number(x: Any) -> Any:
+    # Column value for an int field: the int itself, or NaN (absent) for anything else incl. bools
+    return x if type(x) is int else _NAN
+
+
+def _pack_signals(signals_list: List[Dict[str, Any]]) -> Tuple["np.ndarray", ...]:
+    """
+    One pass over the dicts -> (vt_ratio, abuse_conf, domain_age, flags, prior_incidents)
+    columns, applying the same field rules as score_confidence.
+    """
+    vt: List[Any] = []
+    abuse: List[Any] = []
+    age: List[Any] = []
+    flags: List[int] = []
+    prior: List[Any] = []
+
+    for signals in signals_list:
+        abuse_s = signals.get("abuseipdb")
+        if not isinstance(abuse_s, dict):
+            abuse_s = _EMPTY
+        whois = signals.get("whois")
+        if not isinstance(whois, dict):
+            whois = _EMPTY
+        asn = signals.get("asn")
+        if not isinstance(asn, dict):
+            asn = _EMPTY
+        ctx = signals.get("context")
+        if not isinstance(ctx, dict):
+            ctx = _EMPTY
+
+        vt_ratio = _parse_vt_ratio(signals.get("virustotal"))
+        vt.append(_NAN if vt_ratio is None else vt_ratio)
+
+        abuse.append(_as_number(abuse_s.get("confidence")))
+
+        age.append(_as_number(whois.get("domain_age_days")))
+
+        asn_type = asn.get("type")
+        f = 0
+        if isinstance(asn_type, str) and asn_type.lower() == "hosting":
+            f |= _B_HOSTING
+        if asn.get("is_bulletproof") is True:
+            f |= _B_BULLETPROOF
+        if ctx.get("login_anomaly") is True:
+            f |= _B_LOGIN_ANOMALY
+        if ctx.get("mfa_enabled") is False:
+            f |= _B_MFA_DISABLED
+        flags.append(f)
+
+        prior.append(_as_number(ctx.get("prior_incidents")))
+
+    return _column(vt), _column(abuse), _column(age), np.array(flags, dtype=np.uint8), _column(prior)
+
+
+class _ThresholdTable(NamedTuple):
+    """
+    One tiered signal as data: tier = number of thresholds reached by sign * value,
+    weight = weights[tier]. sign=-1 turns "<=" tiers (domain age) into ">=" ones.
+    """
+    column: int             # index into the _pack_signals columns
+    sign: float
+    thresholds: "np.ndarray"  # float64, ascending, then a NaN sentinel (NaN sorts last)
+    weights: "np.ndarray"     # int64, weights[0] == 0 and 0 for the NaN slot
+
+
+def _tiers(column: int, sign: float, steps: List[Tuple[float, int]]) -> _ThresholdTable:
+    # steps: (threshold, weight) from weakest to strongest tier, compared as sign * value >= threshold.
+    # A weaker threshold beyond a stronger one is unreachable in the if/elif ladder -> cap it.
+    thresholds = [sign * t for t, _ in steps]
+    for i in range(len(thresholds) - 2, -1, -1):
+        thresholds[i] = min(thresholds[i], thresholds[i + 1])
+    return _ThresholdTable(
+        column=column,
+        sign=sign,
+        thresholds=np.array(thresholds + [_NAN], dtype=np.float64),
+        weights=np.array([0] + [w for _, w in steps] + [0], dtype=np.int64),
+    )
+
+
+@lru_cache(maxsize=8)
+def _threshold_tables(cfg: ScoringConfig) -> Tuple[_ThresholdTable, ...]:
+    """
+    Tiered signals of the batch NumPy path, built once per config.
+    """
+    return (
+        _tiers(0, 1.0, [(cfg.vt_malicious_ratio_med, cfg.wt_vt_med), (cfg.vt_malicious_ratio_high, cfg.wt_vt_high)]),
+        _tiers(1, 1.0, [(cfg.abuse_conf_med, cfg.wt_abuse_med), (cfg.abuse_conf_high, cfg.wt_abuse_high)]),
+        _tiers(2, -1.0, [(cfg.domain_new_days, cfg.wt_domain_new),
+                         (cfg.domain_very_new_days, cfg.wt_domain_very_new)]),
+        _tiers(4, 1.0, [(cfg.prior_incidents_threshold, cfg.wt_prior_incidents)]),
+    )
+
+
+def _score_columns_numpy(
+    vt: "np.ndarray",
+    abuse: "np.ndarray",
+    age: "np.ndarray",
+    flags: "np.ndarray",
+    prior: "np.ndarray",
+    c: ScoringConfig
+) -> "np.ndarray":
+    columns = (vt, abuse, age, flags, prior)
+
+    # --- Tiered signals: searchsorted per table (NaN = absent -> past the sentinel -> 0) ---
+    score = np.zeros(len(vt), dtype=np.int64)
+    for table in _threshold_tables(c):
+        values = columns[table.column] if table.sign > 0 else -columns[table.column]
+        score += table.weights[np.searchsorted(table.thresholds, values, side="right")]
+
+    # --- Boolean flags ---
+    score += ((flags & _B_HOSTING) != 0) * c.wt_asn_hosting
+    score += ((flags & _B_BULLETPROOF) != 0) * c.wt_asn_bulletproof
+    score += ((flags & _B_LOGIN_ANOMALY) != 0) * c.wt_login_anomaly
+    score += ((flags & _B_MFA_DISABLED) != 0) * c.wt_mfa_disabled
+
+    # Same clamp order as score_confidence: max(lo, min(hi, n))
+    np.minimum(score, c.max_score, out=score)
+    np.maximum(score, c.min_score, out=score)
+    return score
+
+
+def _batch_levels(score: "np.ndarray", c: _CompiledCfg) -> List[str]:
+    if c.level_lut is not None:
+        return np.array(c.level_lut, dtype=object)[score - c.min_score].tolist()
+    level_idx = np.where(score <= c.level_low_max, 0, np.where(score <= c.level_medium_max, 1, 2))
+    return [_LEVELS[i] for i in level_idx.tolist()]
+
+
+def score_confidence_batch(
+    signals_list: List[Dict[str, Any]],
+    cfg: Optional[ScoringConfig] = None
+) -> ScoreBatch:
+    """
+    score_confidence over many signal dicts (e.g. alert replays), same score/level per item.
+
+    Signals are read in one pass into per-field columns, then scored by a Numba
+    kernel (or NumPy masks without Numba) for the whole batch; no reason strings
+    are formatted. Without NumPy this falls back to per-item scoring.
+    """
+    if np is None:
+        results = [score_confidence(s, cfg) for s in signals_list]
+        return ScoreBatch(
+            scores=[r.score for r in results],
+            levels=[r.level for r in results],
+            signals_list=signals_list,
+            cfg=cfg,
+        )
+
+    c = cfg if cfg is not None else _DEFAULT_CFG
+    columns = _pack_signals(signals_list)
+
+    if _NUMBA_AVAILABLE and _load_numba_kernels():
+        score = np.empty(len(signals_list), dtype=np.int64)
+        kernel = _score_batch_kernel_parallel if len(signals_list) >= _PARALLEL_MIN_ITEMS else _score_batch_kernel
+        kernel(*columns, *_kernel_params(c), score)
+    else:
+        score = _score_columns_numpy(*columns, c)
+
+    return ScoreBatch(
+        scores=score.tolist(),
+        levels=_batch_levels(score, _compiled(cfg)),
+        signals_list=signals_list,
+        cfg=cfg,
+    )
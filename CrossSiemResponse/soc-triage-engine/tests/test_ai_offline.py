@@ -1,3 +1,4 @@
+import asyncio
 import os
 import json
 from pathlib import Path
@@ -5,7 +6,7 @@ from pathlib import Path
 import pytest
 
 from core.pipeline import run_pipeline
-from core.ai.reasoner import reason_with_llm
+from core.ai.reasoner import reason_with_llm, reason_with_llm_async, reason_with_llm_batch_async
 
 
 @pytest.fixture(autouse=True)
@@ -102,6 +103,7 @@ def test_ai_offline_no_network_calls(monkeypatch):
         raise AssertionError("Network call attempted in offline mode")
 
     monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("requests.Session.post", fake_post)
 
     deterministic = run_pipeline(
         incident=_sample_incident(),
@@ -111,3 +113,234 @@ def test_ai_offline_no_network_calls(monkeypatch):
     _ = reason_with_llm(deterministic)
 
     assert called["count"] == 0
+
+
+def test_ai_async_offline_matches_sync():
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+
+    assert asyncio.run(reason_with_llm_async(deterministic)) == reason_with_llm(deterministic)
+
+
+def test_ai_batch_offline_returns_one_result_per_incident():
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+
+    results = asyncio.run(reason_with_llm_batch_async([deterministic, deterministic, deterministic]))
+
+    assert len(results) == 3
+    assert all(r == reason_with_llm(deterministic) for r in results)
+
+
+def test_rate_limit_sliding_window(monkeypatch):
+    from core.ai import reasoner
+
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(reasoner.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(reasoner, "_MAX_CALLS_PER_MIN", 2)
+    monkeypatch.setattr(reasoner, "_call_times", [None, None])
+    monkeypatch.setattr(reasoner, "_call_idx", 0)
+
+    reasoner._enforce_rate_limit()
+    clock["now"] += 30
+    reasoner._enforce_rate_limit()
+    with pytest.raises(reasoner.AIReasonerError):
+        reasoner._enforce_rate_limit()
+
+    # First call leaves the 60s window; one slot frees up
+    clock["now"] += 31
+    reasoner._enforce_rate_limit()
+    with pytest.raises(reasoner.AIReasonerError):
+        reasoner._enforce_rate_limit()
+
+
+@pytest.fixture
+def live_reasoner(monkeypatch):
+    """
+    Live-mode config against a fake HTTP session (still no network).
+    """
+    from collections import OrderedDict
+    from core.ai import reasoner
+
+    monkeypatch.setenv("LLM_OFFLINE", "0")
+    monkeypatch.setenv("LLM_API_KEY", "test-key")
+    monkeypatch.setenv("LLM_MODEL", "test-model")
+    monkeypatch.setattr(reasoner, "_response_cache", OrderedDict())
+    monkeypatch.setattr(reasoner, "_breaker_failures", 0)
+    monkeypatch.setattr(reasoner, "_breaker_open_until", 0.0)
+    monkeypatch.setattr(reasoner, "_call_times", [None] * 10)
+    monkeypatch.setattr(reasoner, "_call_idx", 0)
+    return reasoner
+
+
+def test_ai_identical_requests_served_from_cache(live_reasoner, monkeypatch):
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+    answer = live_reasoner._offline_fallback(deterministic)
+    calls = {"count": 0}
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        content = json.dumps({"choices": [{"message": {"content": json.dumps(answer)}}]}).encode()
+
+    def fake_post(*args, **kwargs):
+        calls["count"] += 1
+        return FakeResponse()
+
+    monkeypatch.setattr(live_reasoner._SESSION, "post", fake_post)
+
+    first = reason_with_llm(deterministic)
+    second = reason_with_llm(deterministic)
+
+    assert calls["count"] == 1
+    assert first == second == answer
+    assert first is not second
+
+
+def test_ai_circuit_opens_after_repeated_provider_failures(live_reasoner, monkeypatch):
+    import requests
+
+    calls = {"count": 0}
+
+    def failing_post(*args, **kwargs):
+        calls["count"] += 1
+        raise requests.ConnectionError("provider down")
+
+    monkeypatch.setattr(live_reasoner._SESSION, "post", failing_post)
+    monkeypatch.setattr(live_reasoner, "_BREAKER_FAILURES", 2)
+
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+
+    for _ in range(2):
+        with pytest.raises(live_reasoner.AIReasonerError):
+            reason_with_llm(deterministic)
+
+    # Circuit open: offline fallback, no further HTTP attempts
+    fallback = reason_with_llm(deterministic)
+    assert fallback == live_reasoner._offline_fallback(deterministic, "circuit_open")
+    assert "circuit breaker open" in fallback["assumptions"][0]
+    assert calls["count"] == 2
+
+
+def _mock_llm_transport(answer, calls):
+    """
+    httpx transport answering every chat-completions request locally,
+    with one result per incident found in the prompt.
+    """
+    import httpx
+
+    def handler(request):
+        prompt = json.loads(request.content)["messages"][1]["content"]
+        calls.append(prompt)
+        if prompt.startswith("You are a SOC triage assistant. Produce one ADVISORY"):
+            n = len(json.loads(prompt[prompt.index("\n["):]))
+            content = {"results": [answer] * n}
+        else:
+            content = answer
+        return httpx.Response(200, json={"choices": [{"message": {"content": json.dumps(content)}}]})
+
+    return httpx.MockTransport(handler)
+
+
+def _mock_llm_client(answer, calls):
+    import httpx
+
+    return httpx.AsyncClient(transport=_mock_llm_transport(answer, calls))
+
+
+def test_ai_batch_splits_oversized_prompt_into_sub_batches(live_reasoner, monkeypatch):
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+    answer = live_reasoner._offline_fallback(deterministic)
+    calls = []
+    monkeypatch.setattr(live_reasoner, "_async_client", _mock_llm_client(answer, calls))
+    monkeypatch.setattr(live_reasoner, "_MAX_PROMPT_CHARS", 6000)
+
+    results = asyncio.run(reason_with_llm_batch_async([deterministic] * 12))
+
+    assert results == [answer] * 12
+    assert 1 < len(calls) < 12
+    assert all(len(prompt) <= 6000 for prompt in calls)
+
+
+def test_ai_batch_reserves_rate_limit_before_any_call(live_reasoner, monkeypatch):
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+    calls = []
+    monkeypatch.setattr(live_reasoner, "_async_client", _mock_llm_client({}, calls))
+    monkeypatch.setenv("LLM_BATCH_MODE", "per_item")
+    monkeypatch.setattr(live_reasoner, "_CACHE_TTL_S", 0)
+
+    with pytest.raises(live_reasoner.AIReasonerError):
+        asyncio.run(reason_with_llm_batch_async([deterministic] * 12))
+
+    assert calls == []
+    assert live_reasoner._call_times == [None] * 10
+
+
+def test_ai_async_without_shared_client_survives_new_event_loops(live_reasoner, monkeypatch):
+    import httpx
+
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+    answer = live_reasoner._offline_fallback(deterministic)
+    calls = []
+    real_client = httpx.AsyncClient
+    transport = _mock_llm_transport(answer, calls)
+    monkeypatch.setattr(live_reasoner, "_async_client", None)
+    monkeypatch.setattr(live_reasoner, "_CACHE_TTL_S", 0)
+    monkeypatch.setattr(
+        live_reasoner.httpx, "AsyncClient", lambda **kwargs: real_client(transport=transport, **kwargs)
+    )
+
+    assert asyncio.run(reason_with_llm_async(deterministic)) == answer
+    assert asyncio.run(reason_with_llm_async(deterministic)) == answer
+    assert len(calls) == 2
+    assert live_reasoner._async_client is None
+
+
+def test_ai_cache_key_covers_endpoint_and_temperature(live_reasoner, monkeypatch):
+    deterministic = run_pipeline(
+        incident=_sample_incident(),
+        signals=_sample_signals(),
+    )
+    answer = live_reasoner._offline_fallback(deterministic)
+    calls = {"count": 0}
+
+    class FakeResponse:
+        def raise_for_status(self):
+            pass
+
+        content = json.dumps({"choices": [{"message": {"content": json.dumps(answer)}}]}).encode()
+
+    def fake_post(*args, **kwargs):
+        calls["count"] += 1
+        return FakeResponse()
+
+    monkeypatch.setattr(live_reasoner._SESSION, "post", fake_post)
+
+    reason_with_llm(deterministic)
+    monkeypatch.setenv("LLM_TEMPERATURE", "0.1")
+    reason_with_llm(deterministic)
+    monkeypatch.setenv("LLM_BASE_URL", "https://llm.internal.example/v1")
+    reason_with_llm(deterministic)
+
+    assert calls["count"] == 3
+
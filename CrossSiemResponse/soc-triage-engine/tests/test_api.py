@@ -0,0 +1,97 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from adapters.local import api
+from core import jsonio
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """
+    API client in offline AI mode (no network, no cost).
+    """
+    monkeypatch.setenv("LLM_OFFLINE", "1")
+    with TestClient(api.app) as c:
+        yield c
+
+
+def _item(incident_id="api-001"):
+    return {
+        "incident": {
+            "incident_id": incident_id,
+            "source": "unit-test",
+            "title": "Suspicious login",
+            "severity": "high",
+            "timestamp": "2026-01-20T12:00:00Z",
+            "entities": [{"type": "ip", "value": "8.8.8.8"}],
+        },
+        "signals": {
+            "abuseipdb": {"confidence": 85},
+            "context": {"login_anomaly": True, "mfa_enabled": False},
+        },
+    }
+
+
+def test_triage_ai_returns_result_with_summary(client):
+    r = client.post("/triage-ai", json=_item())
+
+    assert r.status_code == 200
+    result = r.json()["result"]
+    assert result["incident"]["incident_id"] == "api-001"
+    assert result["summary"]["summary"]
+    assert result["meta"]["mode"] == "deterministic+ai"
+    assert "observations" in result["ai"]
+    assert not [k for k in result if k.startswith("_")]
+
+
+def test_triage_ai_batch_returns_results_in_order(client):
+    r = client.post("/triage-ai/batch", json={"items": [_item("api-001"), _item("api-002")]})
+
+    assert r.status_code == 200
+    results = r.json()["results"]
+    assert [res["incident"]["incident_id"] for res in results] == ["api-001", "api-002"]
+    for res in results:
+        assert res["summary"]["summary"]
+        assert "observations" in res["ai"]
+        assert not [k for k in res if k.startswith("_")]
+
+
+@pytest.mark.parametrize("path", ["/triage-ai", "/triage-ai/batch"])
+@pytest.mark.parametrize("body", [b"{not json", b"[]", b'"text"'])
+def test_malformed_or_non_object_body_is_422(client, path, body):
+    r = client.post(path, content=body, headers={"Content-Type": "application/json"})
+
+    assert r.status_code == 422
+
+
+def test_triage_ai_requires_incident_and_signals_objects(client):
+    r = client.post("/triage-ai", json={"incident": {}, "signals": []})
+
+    assert r.status_code == 422
+    assert "'incident' and 'signals'" in r.json()["detail"]
+
+
+def test_triage_ai_batch_reports_bad_item_index(client):
+    r = client.post("/triage-ai/batch", json={"items": [_item(), {"incident": {}}]})
+
+    assert r.status_code == 422
+    assert r.json()["detail"].startswith("items[1]")
+
+
+def test_triage_ai_batch_enforces_item_cap(client, monkeypatch):
+    monkeypatch.setattr(api, "_MAX_BATCH_ITEMS", 2)
+
+    r = client.post("/triage-ai/batch", json={"items": [_item()] * 3})
+
+    assert r.status_code == 400
+    assert "Batch too large" in r.json()["detail"]
+
+
+def test_triage_ai_keeps_large_integers_exact(client):
+    item = _item()
+    item["incident"]["entities"].append({"type": "account", "value": 123456789012345678901234})
+
+    r = client.post("/triage-ai", content=jsonio.dumps(item), headers={"Content-Type": "application/json"})
+
+    assert r.status_code == 200
+    assert b"123456789012345678901234" in r.content
@@ -0,0 +1,77 @@
+from dataclasses import asdict
+
+from core.mitre import T1071, T1078, T1133, T1566, infer_mitre, infer_mitre_batch, infer_mitre_dicts, infer_mitre_dicts_batch
+
+
+def _account_compromise_signals():
+    return {
+        "virustotal": {"malicious": 12, "total": 94},
+        "abuseipdb": {"confidence": 85},
+        "whois": {"domain_age_days": 3},
+        "asn": {"type": "hosting", "is_bulletproof": True},
+        "context": {
+            "login_anomaly": True,
+            "impossible_travel": True,
+            "mfa_enabled": False,
+            "prior_incidents": 2,
+        },
+    }
+
+
+def test_mitre_ranks_valid_accounts_first_for_account_compromise():
+    hypotheses = infer_mitre(_account_compromise_signals())
+
+    techniques = [h.technique for h in hypotheses]
+    assert techniques[0] == "T1078 - Valid Accounts"
+    assert set(techniques) == {
+        "T1078 - Valid Accounts",
+        "T1133 - External Remote Services",
+        "T1071 - Application Layer Protocol",
+        "T1566 - Phishing",
+    }
+    assert all(0.0 <= h.confidence <= 1.0 for h in hypotheses)
+
+
+def test_mitre_empty_or_malformed_signals():
+    assert infer_mitre({}) == []
+    assert infer_mitre({"context": "not-a-dict", "asn": None}) == []
+
+
+def test_mitre_ignores_bools_in_numeric_fields():
+    signals = {
+        "context": {"prior_incidents": True},
+        "abuseipdb": {"confidence": True},
+        "whois": {"domain_age_days": False},
+    }
+    assert infer_mitre(signals) == []
+    assert infer_mitre_batch([signals]) == [[]]
+
+
+def test_mitre_batch_matches_per_item_inference():
+    batch = [
+        _account_compromise_signals(),
+        {},
+        {"context": {"login_anomaly": True, "mfa_enabled": False}},
+        {"whois": {"domain_age_days": 10}, "virustotal": {"malicious": 5, "total": 70}},
+    ]
+
+    assert infer_mitre_batch(batch) == [infer_mitre(s) for s in batch]
+    assert infer_mitre_batch(batch, min_confidence=0.6, max_results=1) == [
+        infer_mitre(s, min_confidence=0.6, max_results=1) for s in batch
+    ]
+
+
+def test_mitre_dicts_match_hypotheses():
+    batch = [_account_compromise_signals(), {}, {"context": {"login_anomaly": True}}]
+
+    as_dicts = [[asdict(h) for h in infer_mitre(s)] for s in batch]
+    assert [infer_mitre_dicts(s) for s in batch] == as_dicts
+    assert infer_mitre_dicts_batch(batch) == as_dicts
+
+
+def test_mitre_hypotheses_share_technique_constants():
+    constants = {id(t.technique): t for t in (T1078, T1133, T1071, T1566)}
+
+    for h in infer_mitre_dicts(_account_compromise_signals()):
+        t = constants[id(h["technique"])]
+        assert h["tactic"] is t.tactic
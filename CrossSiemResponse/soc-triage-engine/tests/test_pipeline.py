@@ -1,3 +1,5 @@
+from core import jsonio
+from core.context import build_prompt_context, prompt_context_json
 from core.pipeline import run_pipeline
 
 def test_pipeline_runs_end_to_end():
@@ -35,3 +37,32 @@ def test_pipeline_requires_minimal_fields():
         assert False, "Expected PipelineError"
     except Exception as e:
         assert "missing required field" in str(e).lower()
+
+
+def test_prompt_context_is_built_lazily():
+    incident = {
+        "incident_id": "inc-003",
+        "source": "local",
+        "title": "Suspicious sign-in",
+        "severity": "medium",
+        "timestamp": "2026-01-20T12:00:00Z",
+    }
+
+    out = run_pipeline(incident, {"context": {"login_anomaly": True}})
+    keys = list(out)
+
+    # Not serialized by run_pipeline: inputs the LLM layer cannot encode are accepted
+    assert run_pipeline({**incident, "tags": {"vip"}}, {})["incident"]["tags"] == {"vip"}
+    assert jsonio.loads(prompt_context_json(out)) == build_prompt_context(out)
+    assert list(out) == keys
+
+    # Nothing memoized on the output: an edited output is serialized as edited
+    out["incident"]["title"] = "Edited"
+    assert jsonio.loads(prompt_context_json(out))["incident"]["title"] == "Edited"
+
+
+def test_json_round_trips_integers_beyond_64_bits():
+    big = 123456789012345678901234
+
+    assert jsonio.loads(b'{"value": 123456789012345678901234}') == {"value": big}
+    assert jsonio.loads(jsonio.dumps({"value": big})) == {"value": big}
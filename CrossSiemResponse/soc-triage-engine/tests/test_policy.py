@@ -2,6 +2,8 @@ import os
 import pytest
 
 from core.pipeline import run_pipeline
+from core.policy import evaluate_policy
+from core.policy_loader import load_policies
 
 
 def _base_incident():
@@ -84,3 +86,69 @@ def test_missing_policy_file_fails_closed(monkeypatch):
             incident=_base_incident(),
             signals={}
         )
+
+
+def test_policy_file_cached_until_modified(tmp_path):
+    """
+    GIVEN a policy file loaded once
+    WHEN it is loaded again unchanged, then rewritten
+    THEN the parsed policies are reused, then reloaded
+    """
+    path = tmp_path / "policies.json"
+    path.write_text('[{"reason": "first"}]')
+
+    first = load_policies(str(path))
+    assert load_policies(str(path)) is first
+
+    path.write_text('[{"reason": "second"}]')
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert load_policies(str(path)) == [{"reason": "second"}]
+
+
+def test_policy_actions_deduplicated_in_order():
+    """
+    GIVEN overlapping allow/deny rules
+    WHEN policy is evaluated
+    THEN actions are deduplicated and keep first-seen order
+    """
+    decision = evaluate_policy(
+        {
+            "scoring": {"score": 90, "level": "high"},
+            "incident": {"entities": [{"type": "user", "value": "exec@corp.com"}]},
+        },
+        [
+            {"when": {"min_risk": 50}, "effect": {"allow_actions": ["isolate_host", "monitor"]}},
+            {"when": {"entity_type": "user"}, "effect": {"deny_actions": ["contain", "contain"]}},
+            {"when": {"entity_type": "host"}, "effect": {"deny_actions": ["monitor"]}},
+        ],
+    )
+
+    assert decision.allowed_actions == ["monitor", "investigate", "reset_credentials", "isolate_host"]
+    assert decision.denied_actions == ["contain"]
+
+
+def test_policy_tolerates_malformed_entities():
+    """
+    GIVEN entities that are not dicts or carry unhashable types
+    WHEN policy is evaluated
+    THEN rules still apply and malformed entities never match an entity_type rule
+    """
+    output = {
+        "scoring": {"score": 20, "level": "low"},
+        "incident": {"entities": ["8.8.8.8", {"type": ["user"]}, {"type": "user"}]},
+    }
+
+    decision = evaluate_policy(output, [{"when": {"min_risk": 50}, "effect": {"deny_actions": ["monitor"]}}])
+    assert decision.allowed_actions == ["monitor", "investigate"]
+
+    decision = evaluate_policy(
+        output,
+        [
+            {"when": {"entity_type": "user"}, "effect": {"require_approval": True}},
+            {"when": {"entity_type": "host"}, "effect": {"deny_actions": ["monitor"]}},
+        ],
+    )
+    assert decision.requires_approval is True
+    assert decision.denied_actions == []
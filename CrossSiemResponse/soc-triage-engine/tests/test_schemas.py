@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from core.ai.validator import AIOutputValidationError, get_validator, validate_payload
+
+AI_SCHEMA = "schemas/ai_response.schema.json"
+
+
+def test_validator_is_compiled_once_per_schema_file():
+    assert get_validator(AI_SCHEMA) is get_validator(AI_SCHEMA)
+
+
+def test_invalid_ai_output_reports_path():
+    with pytest.raises(AIOutputValidationError) as exc:
+        validate_payload(
+            {
+                "observations": ["Login anomaly detected"],
+                "assessment": "Likely account compromise.",
+                "mitre_mapping": [],
+                "recommendations": [{"type": "unknown", "description": "n/a"}],
+                "confidence": 70,
+                "assumptions": [],
+                "missing_data": [],
+            },
+            AI_SCHEMA,
+        )
+
+    assert "recommendations.0.type" in str(exc.value)
+
+
+def test_batch_parse_validates_items_against_single_response_schema():
+    from core.ai.reasoner import _parse_batch_completion
+
+    item = {
+        "observations": ["Login anomaly detected"],
+        "assessment": "n/a",
+        "mitre_mapping": [],
+        "recommendations": [],
+        "confidence": 150,
+        "assumptions": [],
+        "missing_data": [],
+    }
+    data = {"choices": [{"message": {"content": json.dumps({"results": [item]})}}]}
+
+    with pytest.raises(AIOutputValidationError) as exc:
+        _parse_batch_completion(
+            data,
+            batch_validator=get_validator("schemas/ai_response_batch.schema.json"),
+            validator=get_validator(AI_SCHEMA),
+            expected=1,
+            model="test-model",
+        )
+
+    assert "results[0]" in str(exc.value) and "confidence" in str(exc.value)
+
@@ -1,4 +1,7 @@
-from core.scoring import score_confidence
+import threading
+
+from core import scoring
+from core.scoring import ScoringConfig, score_confidence, score_confidence_batch
 
 def test_scoring_high_confidence():
     signals = {
@@ -18,3 +21,177 @@ def test_scoring_low_confidence_when_empty():
     result = score_confidence({})
     assert result.level == "low"
     assert result.score >= 0
+
+def test_scoring_vt_thresholds_compare_as_floats(monkeypatch):
+    cases = [
+        (ScoringConfig(vt_malicious_ratio_high=0.0125, vt_malicious_ratio_med=0.0124), 0.0121, 0),
+        (ScoringConfig(vt_malicious_ratio_high=0.0125, vt_malicious_ratio_med=0.0124), 0.0125, 30),
+        (ScoringConfig(vt_malicious_ratio_high=0.1005), 0.1001, 15),
+        (ScoringConfig(vt_malicious_ratio_high=0.1005), 0.1005, 30),
+    ]
+    for cfg, ratio, expected in cases:
+        signals = {"virustotal": {"malicious_ratio": ratio}}
+        assert score_confidence(signals, cfg).score == expected
+        assert score_confidence_batch([signals], cfg).scores == [expected]
+
+    monkeypatch.setattr(scoring, "_NUMBA_AVAILABLE", False)
+    for cfg, ratio, expected in cases:
+        assert score_confidence_batch([{"virustotal": {"malicious_ratio": ratio}}], cfg).scores == [expected]
+
+def test_scoring_empty_signals_fast_path():
+    result = score_confidence({})
+    result.reason_codes.append(("login_anomaly", True, 20))
+
+    assert score_confidence({}).reasons == ["No strong deterministic signals found; defaulting to low confidence"]
+    assert score_confidence({}, ScoringConfig(min_score=50, level_low_max=10, level_medium_max=40)).level == "high"
+
+def _batch_signals():
+    return [
+        {
+            "virustotal": {"malicious": 12, "total": 94},
+            "abuseipdb": {"confidence": 85},
+            "whois": {"domain_age_days": 3},
+            "asn": {"type": "Hosting", "is_bulletproof": True},
+            "context": {"login_anomaly": True, "mfa_enabled": False, "prior_incidents": 2}
+        },
+        {},
+        {"virustotal": {"malicious_ratio": 0.05}, "whois": {"domain_age_days": 20}},
+        {"abuseipdb": {"confidence": 60}, "context": {"mfa_enabled": True, "prior_incidents": "2"}},
+    ]
+
+def test_scoring_batch_matches_per_item():
+    batch = _batch_signals()
+    result = score_confidence_batch(batch)
+    expected = [score_confidence(s, return_signals_used=True) for s in batch]
+
+    assert result.scores == [r.score for r in expected]
+    assert result.levels == [r.level for r in expected]
+    assert result.result(2) == expected[2]
+
+def test_scoring_batch_numpy_fallback_matches_kernel(monkeypatch):
+    batch = _batch_signals()
+    expected = score_confidence_batch(batch)
+
+    monkeypatch.setattr(scoring, "_NUMBA_AVAILABLE", False)
+    result = score_confidence_batch(batch)
+
+    assert (result.scores, result.levels) == (expected.scores, expected.levels)
+
+def test_scoring_batch_numpy_fallback_handles_inverted_tiers(monkeypatch):
+    batch = _batch_signals()
+    cfg = ScoringConfig(abuse_conf_high=40, abuse_conf_med=70, domain_very_new_days=30, domain_new_days=7)
+    expected = [score_confidence(s, cfg).score for s in batch]
+
+    monkeypatch.setattr(scoring, "_NUMBA_AVAILABLE", False)
+
+    assert score_confidence_batch(batch, cfg).scores == expected
+
+def test_scoring_batch_parallel_kernel_matches_serial(monkeypatch):
+    batch = _batch_signals()
+    expected = score_confidence_batch(batch)
+
+    monkeypatch.setattr(scoring, "_PARALLEL_MIN_ITEMS", 1)
+    result = score_confidence_batch(batch)
+
+    assert (result.scores, result.levels) == (expected.scores, expected.levels)
+
+    if scoring._NUMBA_AVAILABLE:
+        import numba
+
+        # Raises ValueError unless a parfors (parallel) build has actually run
+        assert numba.threading_layer()
+
+def test_scoring_batch_first_call_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(scoring, "_NUMBA_KERNELS_READY", False)
+    batch = _batch_signals()
+    expected = [score_confidence(s).score for s in batch]
+    barrier = threading.Barrier(8)
+    results, errors = [], []
+
+    def run():
+        barrier.wait()
+        try:
+            results.append(score_confidence_batch(batch).scores)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert results == [expected] * 8
+
+def test_scoring_uses_each_config_instance():
+    signals = {"abuseipdb": {"confidence": 60}}
+
+    assert score_confidence(signals).score == 12
+    assert score_confidence(signals, ScoringConfig(wt_abuse_med=20)).score == 20
+    assert score_confidence(signals, ScoringConfig(abuse_conf_med=70)).score == 0
+    assert score_confidence(signals).score == 12
+
+def test_equal_configs_share_one_compiled_view():
+    cfg = ScoringConfig(vt_malicious_ratio_high=0.25)
+    compiled = scoring._compiled(cfg)
+    assert scoring._compiled(ScoringConfig(vt_malicious_ratio_high=0.25)) is compiled
+    assert scoring._compiled(ScoringConfig(vt_malicious_ratio_high=0.3)) is not compiled
+
+
+def test_scoring_ignores_malformed_sections():
+    result = score_confidence({
+        "abuseipdb": None,
+        "whois": "n/a",
+        "asn": ["hosting"],
+        "context": {"login_anomaly": True},
+    }, return_signals_used=True)
+
+    assert result.score == 20
+    assert result.signals_used == {"context": {"login_anomaly": True}}
+
+def test_scoring_reasons_rendered_from_codes():
+    result = score_confidence({
+        "virustotal": {"malicious_ratio": 0.25},
+        "context": {"login_anomaly": True, "prior_incidents": 3},
+    })
+
+    assert [code for code, _, _ in result.reason_codes] == ["vt_high", "login_anomaly", "prior_incidents"]
+    assert result.reasons == [
+        "VirusTotal malicious ratio high (25.00%) +30",
+        "Login anomaly detected +20",
+        "Entity linked to prior incidents (3) +8",
+    ]
+    assert result.render_reasons(limit=1) == result.reasons[:1]
+
+def test_scoring_level_boundaries():
+    def level(abuse_conf, cfg):
+        return score_confidence({"abuseipdb": {"confidence": abuse_conf}}, cfg).level
+
+    # abuse high/med weights are 25/12
+    narrow = ScoringConfig(level_low_max=11, level_medium_max=24)
+    assert [level(0, narrow), level(60, narrow), level(90, narrow)] == ["low", "medium", "high"]
+
+    # very wide score range falls back to comparisons
+    wide = ScoringConfig(max_score=10**6, level_low_max=11, level_medium_max=24)
+    assert [level(0, wide), level(60, wide), level(90, wide)] == ["low", "medium", "high"]
+
+
+def test_scoring_signals_used_is_opt_in():
+    signals = {"context": {"login_anomaly": True}}
+
+    assert score_confidence(signals).signals_used == {}
+    assert score_confidence(signals, return_signals_used=True).signals_used == {"context": {"login_anomaly": True}}
+
+
+def test_batch_result_is_built_once_per_item():
+    batch = score_confidence_batch(_batch_signals())
+
+    assert batch.result(0) is batch.result(0)
+    assert batch.result(0).score == batch.scores[0]
+
+def test_scoring_ignores_bools_in_numeric_fields():
+    signals = {"abuseipdb": {"confidence": True}, "context": {"prior_incidents": True}}
+
+    assert score_confidence(signals, return_signals_used=True).signals_used == {}
+    assert score_confidence_batch([signals]).scores == [0]